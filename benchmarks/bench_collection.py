@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compares the pspec collection pass against the implementation it replaced.
+
+    python benchmarks/bench_collection.py --sizes 10000 100000 500000
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from pytest_aspec.collection import NodeIdRewriter  # noqa: E402
+
+
+MODULE_TEMPLATE = '''
+import pytest
+
+
+class TestPaymentsApi{index}(object):
+    """Payments API"""
+
+    def test_charges_the_card(self):
+        """it charges the card"""
+
+    def test_refunds_the_card(self):
+        pass
+
+    @pytest.mark.parametrize('amount', range({params}))
+    @pytest.mark.parametrize('currency', ['EUR', 'USD'])
+    def test_amounts(self, amount, currency):
+        """it accepts {{amount}} {{currency}}"""
+
+
+def test_free_function():
+    pass
+'''
+
+
+class _ItemCollector(object):
+
+    def __init__(self):
+        self.items = []
+
+    def pytest_collection_modifyitems(self, items):
+        self.items.extend(items)
+
+
+def collect_items(modules=20, params=250):
+    """
+    Collects a real suite of ``modules * (params * 2 + 3)`` items, mostly
+    parametrized tests of documented classes.
+    """
+    import pytest
+
+    directory = tempfile.mkdtemp(prefix='pspec-bench-')
+    try:
+        for index in range(modules):
+            path = os.path.join(directory, 'test_module_{}.py'.format(index))
+            with open(path, 'w') as f:
+                f.write(MODULE_TEMPLATE.format(index=index, params=params))
+
+        collector = _ItemCollector()
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                pytest.main(
+                    [directory, '--collect-only', '-q',
+                     '-p', 'no:cacheprovider'],
+                    plugins=[collector]
+                )
+            finally:
+                sys.stdout = stdout
+        return collector.items
+    finally:
+        shutil.rmtree(directory)
+
+
+def make_items(items, size):
+    """
+    Repeats the collected items up to ``size``, resetting their nodeids.
+    """
+    repeated = (items * (size // len(items) + 1))[:size]
+    for item in items:
+        item._nodeid = item._pspec_bench_nodeid
+    return repeated
+
+
+def legacy_modifyitems(items):
+    for item in items:
+        node = item.obj
+        parent = item.parent.obj
+        node_parts = item.nodeid.split('::')
+        node_str = node.__doc__ or node_parts[-1]
+
+        if hasattr(item, "callspec"):
+            node_str = node_str.format(**item.callspec.params)
+
+        mode_str = node_parts[0]
+        klas_str = ''
+        node_parts_length = len(node_parts)
+
+        if node_parts_length > 3:
+            klas_str = parent.__doc__ or node_parts[-3]
+        elif node_parts_length > 2:
+            klas_str = parent.__doc__ or node_parts[-2]
+
+        item._nodeid = '::'.join([mode_str, klas_str, node_str])
+
+
+def rewriter_modifyitems(items):
+    NodeIdRewriter().rewrite(items)
+
+
+def measure(function, collected, size, repeat):
+    best = None
+    for _ in range(repeat):
+        items = make_items(collected, size)
+        gc.collect()
+        start = time.perf_counter()
+        function(items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, [item.nodeid for item in items[:len(collected)]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 100000, 500000]
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    collected = collect_items()
+    for item in collected:
+        item._pspec_bench_nodeid = item.nodeid
+
+    print('{:>10} {:>12} {:>12} {:>8}'.format(
+        'items', 'legacy (s)', 'rewriter (s)', 'speedup'
+    ))
+    for size in args.sizes:
+        legacy, legacy_ids = measure(
+            legacy_modifyitems, collected, size, args.repeat
+        )
+        current, current_ids = measure(
+            rewriter_modifyitems, collected, size, args.repeat
+        )
+        if legacy_ids != current_ids:
+            raise SystemExit('nodeids differ for {} items'.format(size))
+        print('{:>10} {:>12.4f} {:>12.4f} {:>7.2f}x'.format(
+            size, legacy, current, legacy / current
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Times the nodeid tokenizer next to the split and join round trips it
+replaced, on pspec nodeids parsed by the reporter and on raw nodeids of
+nested, parametrized tests read by the collection pass.
+
+The tokenizer reads nested classes and parametrize ids the round trips got
+wrong, and does more work than a bare ``str.split`` for it: on raw nodeids
+it takes about twice as long, once per parent node. The ratio is a guard
+against regressions, not a speedup.
+
+    python benchmarks/bench_nodeids.py --number 100000
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from pytest_aspec import formatters  # noqa: E402
+from pytest_aspec.models import (  # noqa: E402
+    Node, NodeCache, PatternConfig, tokenize_nodeid
+)
+
+
+NODEIDS = {
+    'pspec': [
+        'tests/api/test_payments.py::Payments API::it charges the card',
+        'tests/test_module.py::::it works',
+        'tests/test_module.py::TestFoo::it reads a[0]',
+    ],
+    'raw': [
+        'tests/api/test_payments.py::TestPayments::test_charges_the_card',
+        'tests/test_module.py::TestOuter::TestInner::test_inner',
+        'tests/test_module.py::TestFoo::test_amounts[10-EUR-True]',
+    ],
+}
+
+PATTERN_CONFIG = PatternConfig(
+    files=['test_*.py'],
+    functions=['test*'],
+    classes=['Test*'],
+).compile()
+
+
+class LegacyNode(Node):
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, nodeid, pattern_config, cache=None):
+        """
+        ``Node.parse`` as it read the parts off ``nodeid.split('::')``.
+        """
+        node_parts = nodeid.split('::')
+        title = formatters.format_title(
+            node_parts[-1],
+            pattern_config.functions
+        )
+        module_name = cache.format_module_name(node_parts[0])
+        class_name = cache.format_class_name(node_parts[1])
+        return cls(
+            title=title,
+            class_name=class_name,
+            module_name=module_name
+        )
+
+
+def parser(node_class):
+    cache = NodeCache(PATTERN_CONFIG)
+
+    def parse(nodeid):
+        return node_class.parse(nodeid, PATTERN_CONFIG, cache)
+
+    return parse
+
+
+def legacy_prefix(nodeid):
+    node_parts = nodeid.split('::')
+    node_parts_length = len(node_parts)
+
+    klas_str = ''
+    if node_parts_length > 3:
+        klas_str = node_parts[-3]
+    elif node_parts_length > 2:
+        klas_str = node_parts[-2]
+
+    return '{}::{}::'.format(node_parts[0], klas_str)
+
+
+def tokenized_prefix(nodeid):
+    module, classes, _, _ = tokenize_nodeid(nodeid)
+    if not classes:
+        return module + '::::'
+    return '::'.join((module,) + classes) + '::'
+
+
+def cases():
+    return (
+        ('Node.parse', 'pspec', parser(LegacyNode), parser(Node)),
+        ('prefix', 'raw', legacy_prefix, tokenized_prefix),
+    )
+
+
+def measure(function, nodeids, number):
+    def run():
+        for nodeid in nodeids:
+            function(nodeid)
+
+    best = min(timeit.repeat(run, number=number, repeat=5))
+    return best / (number * len(nodeids)) * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    print('{:<20} {:>10} {:>14} {:>8}'.format(
+        'case', 'legacy ns', 'tokenized ns', 'ratio'
+    ))
+    for name, corpus, legacy, tokenized in cases():
+        nodeids = NODEIDS[corpus]
+        before = measure(legacy, nodeids, args.number)
+        after = measure(tokenized, nodeids, args.number)
+        print('{:<20} {:>10.0f} {:>14.0f} {:>7.2f}x'.format(
+            '{} [{}]'.format(name, corpus), before, after, before / after
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the per report cost of the pspec reporting hot path.
+
+    python benchmarks/bench_reporting.py --save baseline.json
+    python benchmarks/bench_reporting.py --compare baseline.json
+
+Every case runs over every corpus and reports the time per operation and
+the memory its results hold per operation. ``--compare`` exits with status 1
+when a case got slower than ``--threshold`` times its baseline.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from _pytest.config import _prepareconfig  # noqa: E402
+from _pytest.reports import TestReport  # noqa: E402
+
+from pytest_aspec import formatters, models  # noqa: E402
+from pytest_aspec.reporter import PspecTerminalReporter  # noqa: E402
+
+PATTERN_CONFIG = models.PatternConfig(
+    files=['test_*.py', '*_test.py'],
+    functions=['test*'],
+    classes=['Test*']
+).compile()
+
+CORPUS_SIZE = 2000
+
+
+def deep_packages():
+    return [
+        '{}::TestFeature{}::test_does_thing_{}'.format(
+            '/'.join(
+                ['src', 'company', 'product', 'component{}'.format(index % 7),
+                 'sub', 'tests', 'unit',
+                 'test_feature_{}.py'.format(index % 40)]
+            ),
+            index % 40,
+            index
+        )
+        for index in range(CORPUS_SIZE)
+    ]
+
+
+def long_camel_case():
+    words = [
+        'Generated', 'HTTP', 'API', 'Client', 'V2', 'For', 'Payments',
+        'Service', 'With', 'Retry', 'And', 'OAuth2', 'Token', 'Refresh'
+    ]
+    class_name = 'Test' + ''.join(words * 3)
+    return [
+        'tests/test_generated.py::{}{}::test_call_{}'.format(
+            class_name, index % 25, index
+        )
+        for index in range(CORPUS_SIZE)
+    ]
+
+
+def heavy_parametrization():
+    return [
+        'tests/test_amounts.py::TestAmounts::test_amounts[{}-EUR-{}]'.format(
+            index, bool(index % 2)
+        )
+        for index in range(CORPUS_SIZE)
+    ]
+
+
+def unicode_docstrings():
+    return [
+        'tests/test_données.py::Les données ünïcödé {}::'
+        'il gère les caractères 日本語 numéro {}'.format(index % 30, index)
+        for index in range(CORPUS_SIZE)
+    ]
+
+
+CORPORA = {
+    'deep-packages': deep_packages,
+    'long-camelcase': long_camel_case,
+    'heavy-parametrization': heavy_parametrization,
+    'unicode-docstrings': unicode_docstrings,
+}
+
+
+def make_reports(nodeids):
+    return [
+        TestReport(
+            nodeid,
+            (nodeid.split('::')[0], index, nodeid.split('::')[-1]),
+            {},
+            'failed' if index % 50 == 0 else 'passed',
+            None,
+            'call',
+            duration=0.001
+        )
+        for index, nodeid in enumerate(nodeids)
+    ]
+
+
+class Reporter(object):
+    """
+    A pspec reporter of a configured session writing to memory.
+    """
+
+    def __init__(self):
+        self.config = _prepareconfig([
+            '--pspec', '-p', 'pytest_aspec.plugin', '-p', 'no:cacheprovider'
+        ])
+        self.config._do_configure()
+        self.file = io.StringIO()
+        self.reporter = PspecTerminalReporter(self.config, self.file)
+
+    def close(self):
+        self.config._ensure_unconfigure()
+
+
+def case_format_title(samples, _):
+    functions = PATTERN_CONFIG.functions
+    return [
+        formatters.format_title(nodeid.rsplit('::', 1)[-1], functions)
+        for nodeid in samples
+    ]
+
+
+def case_format_class_name(samples, _):
+    classes = PATTERN_CONFIG.classes
+    return [
+        formatters.format_class_name(nodeid.split('::')[1], classes)
+        for nodeid in samples
+    ]
+
+
+def case_format_module_name(samples, _):
+    files = PATTERN_CONFIG.files
+    return [
+        formatters.format_module_name(nodeid.split('::')[0], files)
+        for nodeid in samples
+    ]
+
+
+def case_node_parse(samples, _):
+    return [models.Node.parse(nodeid, PATTERN_CONFIG) for nodeid in samples]
+
+
+def case_result_create(samples, reports):
+    return [
+        models.Result.create(report, PATTERN_CONFIG) for report in reports
+    ]
+
+
+def case_logreport(samples, reports, reporter=None):
+    logreport = reporter.reporter.pytest_runtest_logreport
+    reporter.file.seek(0)
+    reporter.file.truncate()
+    return [logreport(report) for report in reports]
+
+
+CASES = {
+    'format_title': case_format_title,
+    'format_class_name': case_format_class_name,
+    'format_module_name': case_format_module_name,
+    'Node.parse': case_node_parse,
+    'Result.create': case_result_create,
+    'pytest_runtest_logreport': case_logreport,
+}
+
+
+def measure(case, samples, reports, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        case(samples, reports)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = case(samples, reports)
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+
+    return {
+        'ns_per_op': best * 1e9 / len(samples),
+        'bytes_per_op': size / len(samples),
+        'peak_bytes_per_op': peak / len(samples),
+    }
+
+
+def run(case_names, corpus_names, repeat):
+    reporter = Reporter()
+    results = {}
+    try:
+        for corpus_name in corpus_names:
+            samples = CORPORA[corpus_name]()
+            reports = make_reports(samples)
+            for case_name in case_names:
+                case = CASES[case_name]
+                if case is case_logreport:
+                    def case(samples, reports, case=case):
+                        return case_logreport(samples, reports, reporter)
+                key = '{} [{}]'.format(case_name, corpus_name)
+                results[key] = measure(case, samples, reports, repeat)
+    finally:
+        reporter.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print('{:<52} {:>10} {:>10} {:>8}'.format(
+        'case', 'base ns', 'ns/op', 'ratio'
+    ))
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        ratio = result['ns_per_op'] / baseline[key]['ns_per_op']
+        flag = ' !' if ratio > threshold else ''
+        print('{:<52} {:>10.0f} {:>10.0f} {:>7.2f}x{}'.format(
+            key, baseline[key]['ns_per_op'], result['ns_per_op'], ratio, flag
+        ))
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        '--case', dest='cases', action='append', choices=sorted(CASES),
+        help='only run this case, may be repeated'
+    )
+    parser.add_argument(
+        '--corpus', dest='corpora', action='append', choices=sorted(CORPORA),
+        help='only run over this corpus, may be repeated'
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH', help='save the results')
+    parser.add_argument(
+        '--compare', metavar='PATH', help='compare with saved results'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=1.10,
+        help='slowdown ratio reported as a regression (default: 1.10)'
+    )
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.cases or list(CASES),
+        args.corpora or list(CORPORA),
+        args.repeat
+    )
+
+    if args.compare:
+        with io.open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    else:
+        regressions = []
+        print('{:<52} {:>10} {:>10} {:>10}'.format(
+            'case', 'ns/op', 'B/op', 'peak B/op'
+        ))
+        for key, result in sorted(results.items()):
+            print('{:<52} {:>10.0f} {:>10.0f} {:>10.0f}'.format(
+                key,
+                result['ns_per_op'],
+                result['bytes_per_op'],
+                result['peak_bytes_per_op']
+            ))
+
+    if args.save:
+        with io.open(args.save, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(results, indent=2, sort_keys=True))
+
+    if regressions:
+        print('{} case(s) regressed'.format(len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
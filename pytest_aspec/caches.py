@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A size bounded mapping that evicts the least recently used entry.
+
+    A ``maxsize`` of ``None`` never evicts and ``0`` disables caching.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return '{}(maxsize={!r}, hits={!r}, misses={!r})'.format(
+            type(self).__name__,
+            self.maxsize,
+            self.hits,
+            self.misses
+        )
+
+    def get(self, key, factory):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = factory(key)
+            if self.maxsize != 0:
+                self._data[key] = value
+                if self.maxsize is not None and \
+                        len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            return value
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
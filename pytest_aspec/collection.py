@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from .models import tokenize_nodeid
+
+
+class NodeIdRewriter(object):
+    """
+    Builds the pspec nodeid of collected items, ``module::class::title``,
+    out of their docstrings. Nested classes make one part each, and ``::``
+    within a docstring is written as ``:`` to keep the parts apart.
+
+    Items of a parent are collected next to each other, so the
+    ``module::class::`` prefix is resolved once per parent and the docstring
+    once per function, however many parametrizations it has.
+
+    ``cached_pspec_nodeid`` leaves the item alone and keeps the names it
+    computed in a side table keyed by the real nodeid instead.
+
+    Items which are not python functions, such as doctests or the items of
+    other plugins, have no docstring to name them after and keep their
+    nodeid.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._parent = None
+        self._prefix = None
+        self._function_name = None
+        self._template = None
+
+    def rewrite(self, items, stored_names=None, group_params=False):
+        pspec_nodeid = self.pspec_nodeid
+        for item in items:
+            if not isinstance(item, pytest.Function):
+                continue
+            if group_params and getattr(item, 'callspec', None) is not None:
+                # named when reported, see ``group_nodeid``
+                continue
+            nodeid = item.nodeid
+            if stored_names is None:
+                rewritten = pspec_nodeid(item, nodeid)
+            else:
+                rewritten = stored_names.get(item, nodeid, pspec_nodeid)
+            if rewritten != nodeid:
+                item._nodeid = rewritten
+
+    def cached_pspec_nodeid(self, item):
+        nodeid = item.nodeid
+        if not isinstance(item, pytest.Function):
+            return nodeid
+        try:
+            return self._names[nodeid]
+        except KeyError:
+            name = self._names[nodeid] = self.pspec_nodeid(item, nodeid)
+            return name
+
+    def pspec_nodeid(self, item, nodeid=None):
+        if nodeid is None:
+            nodeid = item.nodeid
+
+        self._select(item, nodeid)
+        node_str = self._template
+        if node_str is None:
+            node_str = item.name
+
+        if '{' in node_str or '}' in node_str:
+            callspec = getattr(item, 'callspec', None)
+            if callspec is not None:
+                node_str = node_str.format(**callspec.params)
+
+        return self._prefix + _segment(node_str)
+
+    def group_nodeid(self, item):
+        """
+        Returns the pspec nodeid shared by all the variants of a parametrized
+        function: its docstring left unformatted, or its name.
+        """
+        self._select(item, item.nodeid)
+        return self._prefix + _segment(
+            self._template or self._function_name
+        )
+
+    def _select(self, item, nodeid):
+        parent = item.parent
+        if parent is not self._parent:
+            self._parent = parent
+            self._prefix = self._parent_prefix(parent, nodeid)
+            self._function_name = None
+
+        function_name = getattr(item, 'originalname', None) or item.name
+        if function_name != self._function_name:
+            self._function_name = function_name
+            self._template = item.obj.__doc__ or None
+
+    def _parent_prefix(self, parent, nodeid):
+        module, classes, _, _ = tokenize_nodeid(nodeid)
+        if not classes:
+            return module + '::::'
+
+        # the parents of the item from the innermost class out, past the
+        # instance nodes of older pytest versions
+        parts = []
+        for class_name in reversed(classes):
+            while parent.name == '()':
+                parent = parent.parent
+            parts.append(_segment(parent.obj.__doc__ or class_name))
+            parent = parent.parent
+        parts.append(module)
+        parts.reverse()
+        return '::'.join(parts) + '::'
+
+
+def _segment(text):
+    return text.replace('::', ':')
+
+
+class StoredNames(object):
+    """
+    pspec nodeids of previous sessions, kept in pytest's cache per module
+    file along with its modification time, so the names of tests in
+    unchanged modules are not computed again.
+    """
+
+    key = 'pspec/names'
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.modules = cache.get(self.key, None) or {}
+        self.changed = False
+        self._path = None
+        self._names = None
+
+    def get(self, item, nodeid, factory):
+        path = str(item.fspath)
+        if path != self._path:
+            self._path = path
+            self._names = self._module_names(path)
+
+        names = self._names
+        if names is None:
+            return factory(item, nodeid)
+        try:
+            return names[nodeid]
+        except KeyError:
+            name = names[nodeid] = factory(item, nodeid)
+            self.changed = True
+            return name
+
+    def save(self):
+        if self.changed:
+            self.cache.set(self.key, self.modules)
+            self.changed = False
+
+    def _module_names(self, path):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+
+        module = self.modules.get(path)
+        if module is None or module.get('mtime') != mtime:
+            module = self.modules[path] = {'mtime': mtime, 'names': {}}
+            self.changed = True
+        return module['names']
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+pspec documents: the specs of a run grouped by module and class, written
+once the run is over out of the records spooled by ``sinks.ReportSink``.
+"""
+from __future__ import unicode_literals
+
+import os
+import re
+from collections import Counter
+
+from . import renderers, stats
+
+_MARKDOWN_SPECIAL = re.compile(r'([\\`*_\[\]<>#|])')
+
+
+class TextDocument(object):
+    """
+    Writes a document part by part, ``write_document`` calls ``module`` and
+    ``header`` as sections start and ``spec`` for each spec.
+    """
+
+    def __init__(self, out):
+        self.out = out
+
+    def start(self):
+        pass
+
+    def module(self, name):
+        self.out.write('\n{}\n{}\n'.format(name, '=' * len(name)))
+
+    def header(self, name):
+        self.out.write('\n{}\n'.format(name))
+
+    def spec(self, character, record):
+        self.out.write(' {} {}\n'.format(character, record.title))
+
+    def end(self, summary):
+        self.out.write('\n{}\n'.format(summary))
+
+
+class MarkdownDocument(TextDocument):
+
+    def __init__(self, out):
+        super(MarkdownDocument, self).__init__(out)
+        self._in_list = False
+
+    def start(self):
+        self.out.write('# pspec report\n')
+
+    def module(self, name):
+        self._in_list = False
+        self.out.write('\n## {}\n'.format(_markdown(name)))
+
+    def header(self, name):
+        self._in_list = False
+        self.out.write('\n### {}\n'.format(_markdown(name)))
+
+    def spec(self, character, record):
+        if not self._in_list:
+            self.out.write('\n')
+            self._in_list = True
+        self.out.write('- {} {}\n'.format(character, _markdown(record.title)))
+
+    def end(self, summary):
+        self.out.write('\n**{}**\n'.format(summary))
+
+
+class HtmlDocument(TextDocument):
+
+    def __init__(self, out):
+        super(HtmlDocument, self).__init__(out)
+        self._in_list = False
+
+    def start(self):
+        self.out.write(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            '<title>pspec report</title>\n</head>\n<body>\n'
+        )
+
+    def module(self, name):
+        self._close_list()
+        self.out.write('<h2>{}</h2>\n'.format(_escape(name)))
+
+    def header(self, name):
+        self._close_list()
+        self.out.write('<h3>{}</h3>\n'.format(_escape(name)))
+
+    def spec(self, character, record):
+        if not self._in_list:
+            self.out.write('<ul>\n')
+            self._in_list = True
+        self.out.write('<li class="{}">{} {}</li>\n'.format(
+            _escape(record.outcome),
+            _escape(character),
+            _escape(record.title)
+        ))
+
+    def end(self, summary):
+        self._close_list()
+        self.out.write(
+            '<p class="summary">{}</p>\n</body>\n</html>\n'.format(
+                _escape(summary)
+            )
+        )
+
+    def _close_list(self):
+        if self._in_list:
+            self.out.write('</ul>\n')
+            self._in_list = False
+
+
+DOCUMENTS = {
+    'text': TextDocument,
+    'markdown': MarkdownDocument,
+    'html': HtmlDocument,
+}
+
+_EXTENSIONS = {
+    '.md': 'markdown',
+    '.markdown': 'markdown',
+    '.html': 'html',
+    '.htm': 'html',
+}
+
+
+def format_for_path(path):
+    """
+    Returns the document format matching the extension of ``path``, text
+    unless it is a Markdown or HTML file.
+    """
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'text')
+
+
+def write_document(records, out, document_format='text', characters=None):
+    """
+    Writes ``records``, sorted by module file, as a document with a section
+    per module and a header per class, followed by the outcome counts, and
+    returns those counts. Module level specs that follow a class are written
+    under the name of their module.
+    """
+    if characters is None:
+        characters = renderers.outcome_characters({})
+    default = characters['default']
+
+    document = DOCUMENTS[document_format](out)
+    document.start()
+    counts = Counter()
+    path = class_name = None
+    for record in records:
+        if record.path != path:
+            path = record.path
+            class_name = None
+            document.module(record.module_name)
+        if record.class_name != class_name:
+            if record.class_name or class_name is not None:
+                document.header(record.header)
+            class_name = record.class_name
+        document.spec(characters.get(record.outcome, default), record)
+        counts[record.outcome] += 1
+
+    document.end(stats.format_outcomes(counts) or 'no specs')
+    return counts
+
+
+def _escape(text):
+    """
+    Escapes ``text`` for HTML, without the import cost of ``html`` or
+    ``xml.sax.saxutils``.
+    """
+    return (
+        text.replace('&', '&amp;')
+        .replace('<', '&lt;')
+        .replace('>', '&gt;')
+        .replace('"', '&quot;')
+    )
+
+
+def _markdown(text):
+    return _MARKDOWN_SPECIAL.sub(r'\\\1', text)
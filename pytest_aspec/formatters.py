@@ -4,58 +4,103 @@ from __future__ import unicode_literals
 import re
 
 
+class PatternSet(object):
+    """
+    A group of python_* glob patterns compiled once into regular expressions.
+
+    The globs are still removed one after the other, in the order they were
+    configured, so the result is the same as applying them one by one. The
+    combined matcher only lets statements that no pattern can touch skip the
+    substitutions altogether.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        self._regexes = tuple(
+            re.compile(regex)
+            for glob_pattern in self.patterns
+            for regex in _glob_to_regexes(glob_pattern)
+        )
+        self._matcher = None
+        if len(self._regexes) > 1:
+            self._matcher = re.compile('|'.join(
+                '(?:{0})'.format(regex.pattern) for regex in self._regexes
+            ))
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, list(self.patterns))
+
+    def remove(self, statement):
+        if self._matcher is not None and not self._matcher.search(statement):
+            return statement
+
+        for regex in self._regexes:
+            statement = regex.sub('', statement)
+
+        return statement
+
+
+def compile_patterns(patterns):
+    if isinstance(patterns, PatternSet):
+        return patterns
+    return PatternSet(patterns)
+
+
 def format_title(title, patterns):
     return _remove_patterns(title, patterns).replace('_', ' ').strip()
 
 
 def format_class_name(class_name, patterns):
-    formatted = ''
-
     class_name = _remove_patterns(class_name, patterns)
     if ' ' not in class_name:
-        for index, letter in enumerate(class_name):
-            if letter.isupper() and \
-                    _has_lower_letter_besides(index, class_name):
-                formatted += ' '
-
-            formatted += letter
-    else:
-        formatted = class_name
-
-    return formatted.strip()
+        class_name = ' '.join(_split_camel_case(class_name))
+    return class_name.strip()
 
 
 def format_module_name(module_name, patterns):
     return format_title(module_name.split('/')[-1], patterns)
 
 
-def _remove_patterns(statement, patterns):
-    for glob_pattern in patterns:
-        pattern = glob_pattern.replace('*', '')
+def _split_camel_case(name):
+    """
+    Splits ``name`` before every upper case letter next to a lower case one,
+    which keeps acronyms such as ``HTTP`` in one word.
+    """
+    words = []
+    start = 0
+    last = len(name) - 1
+    previous_is_lower = False
+    for index, letter in enumerate(name):
+        is_lower = letter.islower()
+        if index and letter.isupper() and (
+            previous_is_lower or
+            (index < last and name[index + 1].islower())
+        ):
+            words.append(name[start:index])
+            start = index
+        previous_is_lower = is_lower
+    words.append(name[start:])
+    return words
 
-        if glob_pattern.startswith('*'):
-            pattern = '{0}$'.format(pattern)
-            statement = re.sub(pattern, '', statement)
 
-        elif glob_pattern.endswith('*'):
-            pattern = '^{0}'.format(pattern)
-            statement = re.sub(pattern, '', statement)
+def _remove_patterns(statement, patterns):
+    return compile_patterns(patterns).remove(statement)
 
-        elif '*' in glob_pattern:
-            infix_patterns = glob_pattern.split('*', 2)
-            infix_patterns[0] = '{}*'.format(infix_patterns[0])
-            infix_patterns[1] = '*{}'.format(infix_patterns[1])
-            statement = _remove_patterns(statement, infix_patterns)
 
-        else:
-            pattern = '^{0}'.format(pattern)
-            statement = re.sub(pattern, '', statement)
+def _glob_to_regexes(glob_pattern):
+    pattern = glob_pattern.replace('*', '')
 
-    return statement
+    if glob_pattern.startswith('*'):
+        return ['{0}$'.format(pattern)]
 
+    elif glob_pattern.endswith('*'):
+        return ['^{0}'.format(pattern)]
 
-def _has_lower_letter_besides(index, string):
-    letter_before = string[index - 1] if index > 0 else ''
-    letter_after = string[index + 1] if index < len(string) - 1 else ''
+    elif '*' in glob_pattern:
+        infix_patterns = glob_pattern.split('*', 2)
+        return (
+            _glob_to_regexes('{}*'.format(infix_patterns[0])) +
+            _glob_to_regexes('*{}'.format(infix_patterns[1]))
+        )
 
-    return letter_before.islower() or letter_after.islower()
+    return ['^{0}'.format(pattern)]
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import Counter, OrderedDict
+
+from . import formatters, stats
+from .models import FoldedResult, Node, NodePath, Result
+
+
+class HeaderGroups(object):
+    """
+    Holds spec lines back per group while the reports of several xdist
+    workers interleave, so each header is printed once per group. The
+    reporter keys the groups by module file and header, as headers such as
+    class docstrings may repeat across modules.
+
+    A group is released as soon as all the tests expected under its key
+    were reported, or once it holds ``max_lines`` lines. Whatever is left is
+    released by ``pop_all`` at the end of the session.
+    """
+
+    def __init__(self, max_lines=100):
+        self.max_lines = max_lines
+        self.expected = None
+        self._reported = Counter()
+        self._groups = OrderedDict()
+
+    def expect(self, keys):
+        """
+        Sets how many spec lines to wait for under each key, out of the keys
+        of the collected tests.
+        """
+        self.expected = Counter(keys)
+
+    def add(self, key, line):
+        """
+        Adds a line under ``key`` and returns the lines of the group when it
+        is ready to be written, ``None`` otherwise.
+        """
+        lines = self._groups.get(key)
+        if lines is None:
+            lines = self._groups[key] = []
+        lines.append(line)
+        self._reported[key] += 1
+
+        if len(lines) >= self.max_lines or self._is_complete(key):
+            del self._groups[key]
+            return lines
+        return None
+
+    def pop_all(self):
+        groups, self._groups = self._groups, OrderedDict()
+        return list(groups.items())
+
+    def _is_complete(self, key):
+        if self.expected is None:
+            return False
+        return self._reported[key] >= self.expected[key]
+
+
+class ParamFolder(object):
+    """
+    Folds the results of the variants of a parametrized function into one
+    ``FoldedResult``, whatever order they are reported in.
+
+    A function is released once all the variants collected for it were torn
+    down. Whatever is left is released by ``flush`` at the end of the
+    session. Only failed variants get a result of their own, titled out of
+    the variant name given with them.
+    """
+
+    def __init__(self, function_patterns):
+        self.function_patterns = function_patterns
+        self.expected = None
+        self._finished = Counter()
+        self._folds = OrderedDict()
+
+    def expect(self, keys):
+        """
+        Sets how many variants to wait for per function, out of the keys of
+        the collected variants.
+        """
+        self.expected = Counter(keys)
+
+    def add(self, result, key=None, variant=None):
+        """
+        Adds the ``result`` of the variant of the function ``key``, or of a
+        test which is not parametrized when ``key`` is ``None``, and returns
+        the results ready to be written.
+        """
+        if key is None:
+            return [result]
+
+        fold = self._folds.get(key)
+        if fold is None:
+            fold = self._folds[key] = _Fold(result)
+        failed_variant = None
+        if result.outcome == 'failed':
+            failed_variant = Result(
+                'failed',
+                Node(
+                    '  {}'.format(formatters.format_title(
+                        variant or NodePath.parse(result.nodeid).name,
+                        self.function_patterns
+                    )),
+                    result.node.class_name,
+                    result.node.module_name
+                ),
+                duration=result.duration,
+                nodeid=result.nodeid,
+                location=result.location
+            )
+        fold.add(result, failed_variant)
+        return []
+
+    def finish(self, key):
+        """
+        Counts a variant of the function ``key`` as torn down and returns
+        its folded result once all of its variants were.
+        """
+        finished = self._finished[key] = self._finished[key] + 1
+        expected = self.expected and self.expected[key]
+        if not expected or finished < expected:
+            return []
+
+        del self._finished[key]
+        fold = self._folds.pop(key, None)
+        if fold is None:
+            return []
+        return [fold.folded(key)]
+
+    def flush(self):
+        """
+        Returns the folded results of the functions still waiting for some
+        of their variants, in the order they were first reported.
+        """
+        folds, self._folds = self._folds, OrderedDict()
+        self._finished.clear()
+        return [fold.folded(key) for key, fold in folds.items()]
+
+
+class _Fold(object):
+    __slots__ = ('first', 'counts', 'duration', 'failed_variants')
+
+    def __init__(self, first):
+        self.first = first
+        self.counts = Counter()
+        self.duration = 0.0
+        self.failed_variants = []
+
+    def add(self, result, failed_variant=None):
+        self.counts[result.outcome] += 1
+        self.duration += result.duration or 0.0
+        if failed_variant is not None:
+            self.failed_variants.append(failed_variant)
+
+    def folded(self, key):
+        first = self.first
+        counts = self.counts
+        if counts['failed']:
+            outcome = 'failed'
+        elif counts['passed']:
+            outcome = 'passed'
+        else:
+            outcome = first.outcome
+        return FoldedResult(
+            outcome,
+            Node(
+                '{} ({})'.format(
+                    first.node.title,
+                    stats.format_outcomes(counts)
+                ),
+                first.node.class_name,
+                first.node.module_name
+            ),
+            duration=self.duration,
+            nodeid=key,
+            location=first.location,
+            path=first.path,
+            index=first.index,
+            counts=counts,
+            failed_variants=self.failed_variants
+        )
+
+
+def function_key(nodeid):
+    """
+    Returns the key the variants of a parametrized function are folded
+    under, ``parent::function``, out of the real nodeid of one of them, or
+    ``None`` for a test which is not parametrized.
+    """
+    path = NodePath.parse(nodeid)
+    if path.param_id is None:
+        return None
+    return '::'.join((path.module,) + path.classes + (path.function,))
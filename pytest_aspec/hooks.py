@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+The hooks of the pspec reporter, registered along with it by
+``plugin.pytest_configure`` when ``--pspec`` is passed.
+"""
+import pytest
+
+from .reporter import PspecTerminalReporter, pspec_reporter
+
+
+def pytest_terminal_summary(terminalreporter):
+    if isinstance(terminalreporter, PspecTerminalReporter):
+        terminalreporter.summary_durations()
+        terminalreporter.summary_cache()
+        terminalreporter.summary_profile()
+
+
+# the report follows the order the items were collected in, before other
+# plugins reorder them, and nodeids are rewritten once those plugins
+# selected and ordered the items by their real nodeids
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(config, items):
+    reporter = pspec_reporter(config)
+    if reporter is not None and config.option.pspec_report:
+        for index, item in enumerate(items):
+            item.pspec_index = index
+
+    yield
+    if reporter is None:
+        return
+    if reporter.param_folder is not None:
+        reporter.param_folder.expect(
+            _function_key(item)
+            for item in items
+            if getattr(item, 'callspec', None) is not None
+        )
+    if config.option.pspec_lazy_nodeids:
+        return
+
+    reporter.nodeid_rewriter.rewrite(
+        items,
+        reporter.stored_names,
+        group_params=config.option.pspec_group_params
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    reporter = pspec_reporter(item.config)
+    if reporter is None:
+        return
+
+    report = outcome.get_result()
+    group_params = item.config.option.pspec_group_params and \
+        getattr(item, 'callspec', None) is not None
+    if group_params and report.when == 'teardown':
+        # every variant is torn down, even those which failed to set up
+        report.pspec_group = _function_key(item)
+    if report.when != 'call' and not report.skipped:
+        return
+
+    if item.config.option.pspec_report:
+        report.pspec_index = getattr(item, 'pspec_index', None)
+    if group_params:
+        rewriter = reporter.nodeid_rewriter
+        report.pspec_group = _function_key(item)
+        report.pspec_group_title = rewriter.group_nodeid(item)
+        # only the sinks and failed variants need the name of the variant
+        if reporter.writes_results or report.failed:
+            report.pspec_nodeid = rewriter.pspec_nodeid(item)
+        if report.failed:
+            report.pspec_variant = report.pspec_nodeid.rpartition('::')[2]
+    elif item.config.option.pspec_lazy_nodeids:
+        report.pspec_nodeid = reporter.nodeid_rewriter.cached_pspec_nodeid(
+            item
+        )
+    elif reporter.keep_original_nodeids:
+        # only the item's own nodeid gets rewritten at collection time
+        report.pspec_original_nodeid = '::'.join([
+            item.parent.nodeid,
+            item.name
+        ])
+
+
+def _function_key(item):
+    """
+    Returns the key the variants of a parametrized function are folded
+    under, ``parent::function``.
+    """
+    return '::'.join([item.parent.nodeid, item.originalname])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    reporter = pspec_reporter(node.config)
+    if reporter is not None:
+        reporter.expect_nodeids(ids)
+
+
+def pytest_sessionfinish(session):
+    reporter = pspec_reporter(session.config)
+    if reporter is not None:
+        reporter.flush_param_folder()
+        reporter.release_groups()
+        reporter.close_block()
+        if reporter.progress is not None:
+            reporter.progress.clear()
+        if reporter.stored_names is not None:
+            reporter.stored_names.save()
+        reporter.drain(wait=True)
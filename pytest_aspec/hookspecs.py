@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Hooks pytest_aspec calls on other plugins and conftest files.
+"""
+
+
+def pytest_pspec_add_stages(config, pipeline):
+    """
+    Called once when the pspec reporter is configured, to add stages to the
+    ``pytest_aspec.renderers.Pipeline`` rendering spec lines.
+
+    A stage is called as ``stage(result, line)`` with a
+    ``pytest_aspec.models.Result`` and the line rendered so far, and returns
+    the new line::
+
+        def pytest_pspec_add_stages(config, pipeline):
+            pipeline.add_stage(lambda result, line: line.upper())
+    """
@@ -4,23 +4,143 @@ from __future__ import unicode_literals
 from collections import namedtuple
 
 import six
+from six.moves import intern
 
 from . import formatters
+from .caches import LRUCache
+
+
+class PatternConfig(namedtuple('PatternConfig', 'files functions classes')):
+    __slots__ = ()
+
+    def compile(self):
+        return type(self)(*(
+            formatters.compile_patterns(patterns) for patterns in self
+        ))
+
+
+def tokenize_nodeid(nodeid, params=True):
+    """
+    Splits ``nodeid`` into its module, the tuple of classes it is nested in,
+    the function and its parametrize id.
+
+    With ``params``, a trailing ``[...]`` opened in the function name is the
+    parametrize id, which may hold ``::`` itself. pspec nodeids, with titles
+    instead of names, are tokenized without ``params``. The ``()`` instance
+    parts of nodeids of older pytest versions are skipped.
+    """
+    module, separator, rest = nodeid.partition('::')
+    if not separator:
+        return module, (), '', None
+
+    param_id = None
+    if params and rest.endswith(']'):
+        # class and function names are identifiers, so the first bracket
+        # opens the parametrize id
+        bracket = rest.find('[')
+        if bracket != -1:
+            param_id = rest[bracket + 1:-1]
+            rest = rest[:bracket]
+
+    classes, separator, function = rest.rpartition('::')
+    if not separator:
+        return module, (), function, param_id
+    if '::' not in classes:
+        return module, (classes,), function, param_id
+    return module, tuple(
+        name for name in classes.split('::') if name != '()'
+    ), function, param_id
+
+
+def format_class_chain(class_name, patterns):
+    """
+    Formats the ``::`` separated classes a test is nested in as one header.
+    """
+    if '::' not in class_name:
+        return formatters.format_class_name(class_name, patterns)
+    return ' '.join(
+        formatters.format_class_name(name, patterns)
+        for name in class_name.split('::') if name and name != '()'
+    )
+
+
+class NodePath(namedtuple('NodePath', 'module classes function param_id')):
+    """
+    The parts of a nodeid: the module, the chain of classes it is nested in,
+    the function and its parametrize id, if any.
+    """
+    __slots__ = ()
 
-PatternConfig = namedtuple('PatternConfig', 'files functions classes')
+    @classmethod
+    def parse(cls, nodeid, params=True):
+        """
+        Tokenizes ``nodeid``, see ``tokenize_nodeid``.
+        """
+        return cls._make(tokenize_nodeid(nodeid, params))
+
+    @property
+    def name(self):
+        """
+        The function name with its parametrize id, as in the nodeid.
+        """
+        if self.param_id is None:
+            return self.function
+        return '{}[{}]'.format(self.function, self.param_id)
+
+
+class NodeCache(object):
+    """
+    Formatted module and class names of a session, keyed by the raw nodeid
+    component, so tests sharing a module or a class only format it once.
+    """
+
+    def __init__(self, pattern_config, maxsize=None):
+        self.pattern_config = pattern_config
+        self.module_names = LRUCache(maxsize)
+        self.class_names = LRUCache(maxsize)
+
+    def format_module_name(self, module_name):
+        return self.module_names.get(module_name, self._format_module_name)
+
+    def format_class_name(self, class_name):
+        return self.class_names.get(class_name, self._format_class_name)
+
+    def format_path(self, nodeid):
+        """
+        Returns the formatted module and class names of a pspec nodeid, one
+        per nested class.
+        """
+        module_name, classes, _, _ = tokenize_nodeid(nodeid, False)
+        return (self.format_module_name(module_name),) + tuple(
+            self.format_class_name(name) for name in classes if name
+        )
+
+    def _format_module_name(self, module_name):
+        return formatters.format_module_name(
+            module_name,
+            self.pattern_config.files
+        )
+
+    def _format_class_name(self, class_name):
+        return format_class_chain(class_name, self.pattern_config.classes)
 
 
 @six.python_2_unicode_compatible
 class Node(object):
+    __slots__ = ('title', 'class_name', 'module_name')
 
     def __init__(self, title, class_name, module_name):
         self.title = title
-        self.class_name = class_name
-        self.module_name = module_name
+        self.class_name = intern(class_name)
+        self.module_name = intern(module_name)
 
     def __str__(self):
         return self.title
 
+    @property
+    def header(self):
+        return self.class_name or self.module_name
+
     def __repr__(self):
         return '{}(title={!r}, class_name={!r}, module_name={!r})'.format(
             type(self).__name__,
@@ -30,42 +150,104 @@ class Node(object):
         )
 
     @classmethod
-    def parse(cls, nodeid, pattern_config):
-        node_parts = nodeid.split('::')
-        title = formatters.format_title(
-            node_parts[-1],
-            pattern_config.functions
-        )
-        module_name = formatters.format_module_name(
-            node_parts[0],
-            pattern_config.files
-        )
-        class_name = formatters.format_class_name(
-            node_parts[1],
-            pattern_config.classes
-        )
+    def parse(cls, nodeid, pattern_config, cache=None):
+        """
+        Parses a pspec nodeid, ``module::class::title``. Nested classes are
+        joined into one header.
+        """
+        # the two cuts of ``tokenize_nodeid`` without params, inlined as the
+        # class chain is formatted, and cached, as a whole
+        module_name, _, rest = nodeid.partition('::')
+        class_name, _, title = rest.rpartition('::')
+        title = formatters.format_title(title, pattern_config.functions)
+        if cache is not None:
+            module_name = cache.format_module_name(module_name)
+            class_name = cache.format_class_name(class_name)
+        else:
+            module_name = formatters.format_module_name(
+                module_name,
+                pattern_config.files
+            )
+            class_name = format_class_chain(
+                class_name,
+                pattern_config.classes
+            )
 
         return cls(title=title, class_name=class_name, module_name=module_name)
 
 
 @six.python_2_unicode_compatible
 class Result(object):
-    def __init__(self, outcome, node):
+    __slots__ = (
+        'outcome', 'node', 'duration', 'nodeid', 'location', 'path', 'index'
+    )
+
+    def __init__(self, outcome, node, duration=None, nodeid=None,
+                 location=None, path=None, index=None):
         self.outcome = outcome
         self.node = node
+        self.duration = duration
+        self.nodeid = nodeid
+        self.location = location
+        # the headers of ``--pspec-tree``, module first
+        self.path = path
+        # the position of the item in the collection, for ``--pspec-report``
+        self.index = index
 
     def __repr__(self):
-        return '{}(outcome={!r}, node={!r})'.format(
-            type(self).__name__,
-            self.outcome,
-            self.node
+        return (
+            '{}(outcome={!r}, node={!r}, duration={!r}, nodeid={!r}, '
+            'location={!r})'.format(
+                type(self).__name__,
+                self.outcome,
+                self.node,
+                self.duration,
+                self.nodeid,
+                self.location
+            )
         )
 
     @property
     def header(self):
-        return self.node.class_name or self.node.module_name
+        return self.node.header
 
     @classmethod
-    def create(cls, report, pattern_config):
-        node = Node.parse(report.nodeid, pattern_config)
-        return cls(report.outcome, node)
+    def create(cls, report, pattern_config, cache=None, pspec_nodeid=None):
+        """
+        Creates the result of ``report``, named after ``pspec_nodeid`` or
+        the pspec nodeid of the report.
+        """
+        if pspec_nodeid is None:
+            pspec_nodeid = getattr(report, 'pspec_nodeid', report.nodeid)
+        node = Node.parse(pspec_nodeid, pattern_config, cache)
+        return cls(
+            report.outcome,
+            node,
+            duration=report.duration,
+            nodeid=getattr(report, 'pspec_original_nodeid', report.nodeid),
+            location=report.location,
+            index=getattr(report, 'pspec_index', None)
+        )
+
+
+class FoldedResult(Result):
+    """
+    The result of all the variants of a parametrized function, with the
+    ``counts`` of their outcomes and a result per failed variant.
+    """
+    __slots__ = ('counts', 'failed_variants')
+
+    def __init__(self, outcome, node, duration=None, nodeid=None,
+                 location=None, path=None, index=None, counts=None,
+                 failed_variants=()):
+        super(FoldedResult, self).__init__(
+            outcome,
+            node,
+            duration=duration,
+            nodeid=nodeid,
+            location=location,
+            path=path,
+            index=index
+        )
+        self.counts = counts or {}
+        self.failed_variants = list(failed_variants)
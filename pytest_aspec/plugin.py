@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
+"""
+The pytest entry point of pytest_aspec. It only declares the options and
+hooks, the reporter and the hooks it needs are imported and registered once
+``--pspec`` is passed, so sessions without it don't pay for them.
+"""
 import pytest
-from _pytest.terminal import TerminalReporter
 
-from . import models
-from .wrappers import OutcomeCharacters, UnicodeWrapper
+from . import hookspecs
+
+#: The formats of ``--pspec-report``, see ``documents.DOCUMENTS``.
+REPORT_FORMATS = ('html', 'markdown', 'text')
 
 _PSPEC_OPTIONS = [
     ('pspec_passed', 'passed',
@@ -23,6 +29,117 @@ def pytest_addoption(parser):
         '--pspec', action='store_true', dest='pspec', default=False,
         help='Report test progress in pspec format'
     )
+    group.addoption(
+        '--pspec-cache-size', action='store', dest='pspec_cache_size',
+        type=int, default=4096, metavar='N',
+        help='Number of formatted module and class names pspec keeps '
+             'cached, 0 disables the cache (default: 4096)'
+    )
+    group.addoption(
+        '--pspec-buffer', action='store', dest='pspec_buffer',
+        type=int, default=0, metavar='N',
+        help='Write pspec output in batches of N lines, it is still flushed '
+             'on header changes, failures and at the end of the session'
+    )
+    group.addoption(
+        '--pspec-async', action='store', dest='pspec_async',
+        type=int, default=0, metavar='N',
+        help='Write the output from a background thread fed through a queue '
+             'of N writes, test execution waits only once the queue is full'
+    )
+    group.addoption(
+        '--pspec-xdist-group-size', action='store',
+        dest='pspec_xdist_group_size', type=int, default=100, metavar='N',
+        help='With pytest-xdist, hold up to N spec lines per header before '
+             'printing them together (default: 100)'
+    )
+    group.addoption(
+        '--pspec-lazy-nodeids', action='store_true',
+        dest='pspec_lazy_nodeids', default=False,
+        help='Keep the real nodeids of collected tests and only compute the '
+             'pspec names of the tests that get reported'
+    )
+    group.addoption(
+        '--pspec-store-names', action='store_true',
+        dest='pspec_store_names', default=False,
+        help='Keep the pspec names of collected tests in the pytest cache '
+             'and reuse them for the modules that did not change'
+    )
+    group.addoption(
+        '--pspec-group-params', action='store_true',
+        dest='pspec_group_params', default=False,
+        help='Write one spec per parametrized function with the counts of '
+             'its variants, followed by the variants that failed'
+    )
+    group.addoption(
+        '--pspec-jsonl', action='store', dest='pspec_jsonl',
+        default=None, metavar='PATH',
+        help='Stream one JSON record per pspec result to PATH'
+    )
+    group.addoption(
+        '--pspec-jsonl-flush', action='store', dest='pspec_jsonl_flush',
+        type=float, default=1.0, metavar='SECONDS',
+        help='Flush the --pspec-jsonl file at most every SECONDS '
+             '(default: 1.0)'
+    )
+    group.addoption(
+        '--pspec-shard', action='store', dest='pspec_shard',
+        default=None, metavar='PATH',
+        help='Write the results to PATH as a shard which `pspec merge` '
+             'merges with the shards of other runs'
+    )
+    group.addoption(
+        '--pspec-report', action='store', dest='pspec_report',
+        default=None, metavar='PATH',
+        help='Write the specs to PATH at the end of the session, grouped by '
+             'module and class whatever order they ran in'
+    )
+    group.addoption(
+        '--pspec-report-format', action='store', dest='pspec_report_format',
+        choices=REPORT_FORMATS, default=None,
+        help='Format of --pspec-report, by default markdown or html after '
+             'the extension of PATH and text otherwise'
+    )
+    group.addoption(
+        '--pspec-lean-stats', action='store_true', dest='pspec_lean_stats',
+        default=False,
+        help='Only count passing tests and keep truncated failure reports '
+             'for the session summary'
+    )
+    group.addoption(
+        '--pspec-durations', action='store', dest='pspec_durations',
+        type=int, default=None, metavar='N',
+        help='Show the duration of each spec, the total of each header block '
+             'and the N slowest headers at the end (N=0 for all)'
+    )
+    group.addoption(
+        '--pspec-collapse', action='store_true', dest='pspec_collapse',
+        default=False,
+        help='Only write one summary line per header followed by its '
+             'failed specs'
+    )
+    group.addoption(
+        '--pspec-tree', action='store_true', dest='pspec_tree',
+        default=False,
+        help='Write the module and the nested classes of the specs as an '
+             'indented tree, printing only the part of the path that changes'
+    )
+    group.addoption(
+        '--pspec-progress', action='store_true', dest='pspec_progress',
+        default=False,
+        help='Keep a progress line with the throughput, the ETA and the '
+             'current header under the specs, on a terminal only'
+    )
+    group.addoption(
+        '--pspec-profile', action='store_true', dest='pspec_profile',
+        default=False,
+        help='Time the pspec hooks and report their overhead at the end'
+    )
+    group.addoption(
+        '--pspec-profile-file', action='store', dest='pspec_profile_file',
+        default=None, metavar='PATH',
+        help='With --pspec-profile, also write the timings to PATH as JSON'
+    )
     for x, _, help_message in _PSPEC_OPTIONS:
         parser.addini(
             x,
@@ -31,90 +148,30 @@ def pytest_addoption(parser):
         )
 
 
-@pytest.mark.trylast
+def pytest_addhooks(pluginmanager):
+    pluginmanager.add_hookspecs(hookspecs)
+
+
+@pytest.hookimpl(trylast=True)
 def pytest_configure(config):
     if config.option.pspec:
+        from . import hooks, reporter
+
         # Get the standard terminal reporter plugin and replace it with ours
         standard_reporter = config.pluginmanager.getplugin('terminalreporter')
-        pspec_reporter = PspecTerminalReporter(standard_reporter.config)
+        pspec_reporter = reporter.PspecTerminalReporter(
+            standard_reporter.config
+        )
         config.pluginmanager.unregister(standard_reporter)
         config.pluginmanager.register(pspec_reporter, 'terminalreporter')
+        config.pluginmanager.register(hooks, 'pspec-hooks')
 
 
-def pytest_collection_modifyitems(config, items):
-    if not config.option.pspec:
-        return
-
-    for item in items:
-        node = item.obj
-        parent = item.parent.obj
-        node_parts = item.nodeid.split('::')
-        node_str = node.__doc__ or node_parts[-1]
-
-        if hasattr(item, "callspec"):
-            node_str = node_str.format(**item.callspec.params)
-
-        mode_str = node_parts[0]
-        klas_str = ''
-        node_parts_length = len(node_parts)
-
-        if node_parts_length > 3:
-            klas_str = parent.__doc__ or node_parts[-3]
-        elif node_parts_length > 2:
-            klas_str = parent.__doc__ or node_parts[-2]
-
-        item._nodeid = '::'.join([mode_str, klas_str, node_str])
-
-
-class PspecTerminalReporter(TerminalReporter):
-
-    def __init__(self, config, file=None):
-        TerminalReporter.__init__(self, config, file)
-        self._last_header = None
-        self.pattern_config = models.PatternConfig(
-            files=self.config.getini('python_files'),
-            functions=self.config.getini('python_functions'),
-            classes=self.config.getini('python_classes')
-        )
-        self.result_wrappers = []
-        self.result_wrappers.append(UnicodeWrapper)
-        for option_name, attr_name, _ in _PSPEC_OPTIONS:
-            value = config.getini(option_name)
-            if value:
-                try:
-                    value = eval(f"'{value}'")
-                except:
-                    pass
-                setattr(OutcomeCharacters, attr_name, value)
-
-    def _register_stats(self, report):
-        """
-        This method is not created for this plugin, but it is needed in order
-        to the reporter display the tests summary at the end.
-
-        Originally from:
-        https://github.com/pytest-dev/pytest/blob/47a2a77/_pytest/terminal.py#L198-L201
-        """
-        res = self.config.hook.pytest_report_teststatus(
-            report=report,
-            config=self.config)
-        category = res[0]
-        self.stats.setdefault(category, []).append(report)
-        self._tests_ran = True
-
-    def pytest_runtest_logreport(self, report):
-        self._register_stats(report)
-
-        if report.when != 'call' and not report.skipped:
-            return
-
-        result = models.Result.create(report, self.pattern_config)
-
-        for wrapper in self.result_wrappers:
-            result = wrapper(result)
-
-        if result.header != self._last_header:
-            self._last_header = result.header
-            self._tw.sep(' ')
-            self._tw.line(result.header)
-            self._tw.line(str(result))
+def __getattr__(name):
+    # the reporter used to be defined here
+    if name == 'PspecTerminalReporter':
+        from .reporter import PspecTerminalReporter
+        return PspecTerminalReporter
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import functools
+import io
+import json
+import time
+from array import array
+from collections import OrderedDict
+
+
+class Profiler(object):
+    """
+    Collects the wall time of every call to the functions it wraps, one
+    double per call, to report how much time the plugin adds to a session.
+
+    Nothing is wrapped unless the profiler is asked to, so a session without
+    ``--pspec-profile`` pays nothing for it.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.samples = OrderedDict()
+
+    def wrap(self, name, func):
+        samples = self.samples.setdefault(name, array('d'))
+        clock = self.clock
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append(clock() - start)
+
+        return timed
+
+    def wrap_method(self, name, obj, attr_name):
+        """
+        Times ``obj.attr_name`` by shadowing it with an instance attribute.
+        """
+        setattr(obj, attr_name, self.wrap(name, getattr(obj, attr_name)))
+
+    def patch(self, name, owner, attr_name):
+        """
+        Times the class or static method ``owner.attr_name`` until the
+        returned function is called to restore it.
+        """
+        original = owner.__dict__[attr_name]
+        wrapped = self.wrap(name, getattr(owner, attr_name))
+        setattr(owner, attr_name, staticmethod(wrapped))
+
+        def restore():
+            setattr(owner, attr_name, original)
+
+        return restore
+
+    def summary(self):
+        """
+        Returns one ``(name, calls, total, p50, p99)`` tuple per timed
+        function, in seconds.
+        """
+        return [
+            (name,) + _statistics(samples)
+            for name, samples in self.samples.items()
+        ]
+
+    def write(self, path):
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(
+                [
+                    {
+                        'name': name,
+                        'calls': calls,
+                        'total': total,
+                        'p50': p50,
+                        'p99': p99,
+                    }
+                    for name, calls, total, p50, p99 in self.summary()
+                ],
+                indent=2
+            ))
+
+
+def _statistics(samples):
+    if not samples:
+        return 0, 0.0, 0.0, 0.0
+    ordered = sorted(samples)
+    return (
+        len(ordered),
+        sum(ordered),
+        _percentile(ordered, 0.50),
+        _percentile(ordered, 0.99),
+    )
+
+
+def _percentile(ordered, fraction):
+    return ordered[int(round(fraction * (len(ordered) - 1)))]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+#: Moves back to the start of the line and erases it.
+CLEAR_LINE = '\r\x1b[K'
+
+
+class ProgressFooter(object):
+    """
+    A status line kept under the spec lines of a terminal, showing the
+    completed and total tests, the throughput, the ETA and the current header.
+
+    The footer is erased before anything else is written and shown again,
+    as it was, when the next test starts. Its text is only recomputed every
+    ``interval`` seconds.
+    """
+
+    def __init__(self, tw, interval=0.2, clock=time.monotonic):
+        self.tw = tw
+        self.interval = interval
+        self.clock = clock
+        self.total = None
+        self.completed = 0
+        self.header = None
+        self.visible = False
+        self._text = None
+        self._started_at = None
+        self._formatted_at = None
+
+    def start(self, total):
+        self.total = total
+        self._started_at = self.clock()
+
+    def update(self, completed, header=None):
+        self.completed = completed
+        if header is not None:
+            self.header = header
+
+        if self._text is None or \
+                self.clock() - self._formatted_at >= self.interval:
+            self._refresh()
+
+    def show(self):
+        """
+        Draws the footer again once it was cleared, with its last text.
+        """
+        if self.visible:
+            return
+        if self._text is None:
+            self._refresh()
+        else:
+            self._draw()
+
+    def clear(self):
+        if self.visible:
+            self.tw.write(CLEAR_LINE)
+            self.visible = False
+
+    def format(self, now):
+        elapsed = now - self._started_at
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            done = '[{}/{}]'.format(self.completed, self.total)
+        else:
+            done = '[{}]'.format(self.completed)
+        parts = [done, '{:.1f} tests/s'.format(rate)]
+        if self.total and rate > 0:
+            remaining = max(self.total - self.completed, 0) / rate
+            parts.append('ETA {}'.format(
+                datetime.timedelta(seconds=int(remaining))
+            ))
+        if self.header:
+            parts.append(self.header)
+        return ' '.join(parts)
+
+    def _refresh(self):
+        now = self.clock()
+        if self._started_at is None:
+            self._started_at = now
+        self._formatted_at = now
+        self._text = self.format(now)
+        self._draw()
+
+    def _draw(self):
+        text = self._text[:max(self.tw.fullwidth - 1, 0)]
+        self.tw.write(CLEAR_LINE + text)
+        self.tw.flush()
+        self.visible = True
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+pspec shard files and the merge of the shards written by several runs.
+
+A shard holds one JSON array per line, a ``Record``, sorted by module file,
+class, line and nodeid, so shards are merged by streaming them side by side::
+
+    python -m pytest_aspec.records merge shards/*.jsonl
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import heapq
+import io
+import json
+import sys
+from collections import Counter, namedtuple
+
+from . import renderers, stats
+
+
+class Record(namedtuple('Record', (
+    'path class_name line nodeid module_name title outcome duration index'
+))):
+    """
+    A result as stored in a shard. Records sort in the order they are
+    reported in, grouped by module file and class.
+
+    ``index`` is the position of the test in the collection of its run, it
+    is missing from the shards of earlier versions.
+    """
+    __slots__ = ()
+
+    @property
+    def header(self):
+        return self.class_name or self.module_name
+
+    @classmethod
+    def from_result(cls, result):
+        line = -1
+        if result.location is not None and result.location[1] is not None:
+            line = result.location[1]
+        return cls(
+            path=result.nodeid.split('::', 1)[0],
+            class_name=result.node.class_name,
+            line=line,
+            nodeid=result.nodeid,
+            module_name=result.node.module_name,
+            title=result.node.title,
+            outcome=result.outcome,
+            duration=result.duration,
+            index=result.index,
+        )
+
+
+Record.__new__.__defaults__ = (None,)
+
+
+def write_records(path, records):
+    with io.open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(list(record), ensure_ascii=False))
+            f.write('\n')
+
+
+def read_records(path):
+    with io.open(path, encoding='utf-8') as f:
+        for line in f:
+            yield Record(*json.loads(line))
+
+
+def merge(paths):
+    """
+    Streams the records of the sorted shards at ``paths`` in order, holding
+    one record per shard in memory.
+    """
+    return heapq.merge(*[read_records(path) for path in paths])
+
+
+def write_report(records, out, characters=None):
+    """
+    Writes ``records`` grouped under their headers the way ``--pspec`` does,
+    followed by the outcome counts, and returns those counts.
+    """
+    if characters is None:
+        characters = renderers.outcome_characters({})
+    default = characters['default']
+
+    counts = Counter()
+    last_header = None
+    for record in records:
+        header = record.header
+        if header != last_header:
+            last_header = header
+            out.write('\n{}\n'.format(header))
+        out.write(' {} {}\n'.format(
+            characters.get(record.outcome, default),
+            record.title
+        ))
+        counts[record.outcome] += 1
+
+    out.write('\n{}\n'.format(stats.format_outcomes(counts) or 'no specs'))
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pspec')
+    commands = parser.add_subparsers(dest='command')
+    merge_parser = commands.add_parser(
+        'merge',
+        help='merge pspec shards into one report'
+    )
+    merge_parser.add_argument('shards', nargs='+', metavar='SHARD')
+    merge_parser.add_argument(
+        '-o', '--output', metavar='PATH',
+        help='write the report to PATH instead of the standard output'
+    )
+    args = parser.parse_args(argv)
+    if args.command != 'merge':
+        parser.error('a command is required')
+
+    if args.output:
+        with io.open(args.output, 'w', encoding='utf-8') as out:
+            counts = write_report(merge(args.shards), out)
+    else:
+        counts = write_report(merge(args.shards), sys.stdout)
+
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import codecs
+
+from .wrappers import OutcomeCharacters
+
+OUTCOMES = ('passed', 'failed', 'skipped', 'default')
+
+
+class Pipeline(object):
+    """
+    Renders a ``Result`` to its spec line.
+
+    ``render`` writes the line out of the result, then each stage, called as
+    ``stage(result, line)``, returns the line updated. The stages are
+    composed once by ``compose`` into the single function called per report.
+    """
+
+    def __init__(self, render):
+        self.render = render
+        self.stages = []
+
+    def add_stage(self, stage):
+        self.stages.append(stage)
+
+    def compose(self):
+        render = self.render
+        stages = tuple(self.stages)
+        if not stages:
+            return render
+
+        def render_stages(result):
+            line = render(result)
+            for stage in stages:
+                line = stage(result, line)
+            return line
+
+        return render_stages
+
+
+def outcome_renderer(characters, default):
+    """
+    Returns the function writing ``' {character} {title}'`` lines, out of the
+    outcome ``characters`` mapping.
+    """
+    get_character = characters.get
+
+    def render(result):
+        return ' {} {}'.format(
+            get_character(result.outcome, default),
+            result.node.title
+        )
+
+    return render
+
+
+def decode_symbol(value):
+    """
+    Decodes the backslash escapes of an ini value, ``\\N{...}`` names
+    included, the way a python string literal would. Values with a broken
+    escape are kept as they are.
+    """
+    try:
+        return value.encode('latin-1', 'backslashreplace').decode(
+            'unicode_escape'
+        )
+    except UnicodeDecodeError:
+        return value
+
+
+def outcome_characters(values, encoding=None):
+    """
+    Returns the character of each outcome, out of the ``pspec_*`` ini
+    ``values`` by outcome, falling back to ``OutcomeCharacters``.
+
+    With an ``encoding``, characters it cannot encode are backslash escaped
+    once here rather than when each line is written.
+    """
+    if encoding is not None:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = None
+
+    characters = {}
+    for outcome in OUTCOMES:
+        value = values.get(outcome)
+        if value:
+            character = decode_symbol(value)
+        else:
+            character = getattr(OutcomeCharacters, outcome)
+        if encoding is not None:
+            character = character.encode(
+                encoding,
+                'backslashreplace'
+            ).decode(encoding)
+        characters[outcome] = character
+    return characters
+
+
+def duration_stage(result, line):
+    return '{} ({:.2f}s)'.format(line, result.duration or 0.0)
@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+import sys
+from collections import Counter
+
+from _pytest.terminal import TerminalReporter
+
+from . import collection, models, renderers, stats
+from .groups import HeaderGroups, ParamFolder, function_key
+from .plugin import _PSPEC_OPTIONS
+from .profiling import Profiler
+from .progress import ProgressFooter
+from .sinks import JsonLinesSink, ReportSink, ShardSink
+from .tree import PathStack
+from .writers import BufferedFile, ThreadedFile
+
+
+def pspec_reporter(config):
+    """
+    Returns the pspec reporter of a session, or None when it isn't on.
+    """
+    reporter = config.pluginmanager.getplugin('terminalreporter')
+    if isinstance(reporter, PspecTerminalReporter):
+        return reporter
+    return None
+
+
+def _is_xdist_controller(config):
+    """
+    Whether reports of pytest-xdist workers come in, decided the way xdist
+    decides to start its ``dsession``, which it only registers in its own
+    ``trylast`` configure hook.
+    """
+    return (
+        not hasattr(config, 'workerinput') and
+        config.getoption('dist', 'no') != 'no' and
+        not config.getoption('collectonly', False)
+    )
+
+
+def _ini_characters(config):
+    return {
+        outcome: config.getini(option_name)
+        for option_name, outcome, _ in _PSPEC_OPTIONS
+    }
+
+
+class PspecTerminalReporter(TerminalReporter):
+
+    def __init__(self, config, file=None):
+        self._threaded_file = None
+        if config.option.pspec_async > 0:
+            self._threaded_file = ThreadedFile(
+                file or sys.stdout,
+                config.option.pspec_async
+            )
+            file = self._threaded_file
+        self._buffered_file = None
+        if config.option.pspec_buffer > 0:
+            self._buffered_file = BufferedFile(
+                file or sys.stdout,
+                config.option.pspec_buffer
+            )
+            file = self._buffered_file
+        # uncaptured test output goes straight to the terminal, so output
+        # held back for earlier tests is written before each test starts
+        self._uncaptured = config.getoption('capture', None) == 'no'
+        self._drain_before_tests = (
+            self._uncaptured and
+            (self._buffered_file is not None or
+             self._threaded_file is not None)
+        )
+        TerminalReporter.__init__(self, config, file)
+        self._last_header = None
+        self.pattern_config = models.PatternConfig(
+            files=self.config.getini('python_files'),
+            functions=self.config.getini('python_functions'),
+            classes=self.config.getini('python_classes')
+        ).compile()
+        self.nodeid_rewriter = collection.NodeIdRewriter()
+        self.stored_names = None
+        if config.option.pspec_store_names and \
+                getattr(config, 'cache', None) is not None:
+            self.stored_names = collection.StoredNames(config.cache)
+        self.node_cache = models.NodeCache(
+            self.pattern_config,
+            maxsize=config.option.pspec_cache_size
+        )
+        self.header_groups = None
+        self._last_group = None
+        if _is_xdist_controller(config):
+            self.header_groups = HeaderGroups(
+                max_lines=config.option.pspec_xdist_group_size
+            )
+        self.keep_original_nodeids = bool(
+            config.option.pspec_jsonl or config.option.pspec_shard
+        )
+        # set on xdist workers too, which name the results for the sinks
+        self.writes_results = bool(
+            self.keep_original_nodeids or config.option.pspec_report
+        )
+        self.sinks = []
+        # xdist workers send their reports to the controller which writes
+        # them, only the controller opens the sinks
+        if not hasattr(config, 'workerinput'):
+            if config.option.pspec_jsonl:
+                self.sinks.append(JsonLinesSink(
+                    config.option.pspec_jsonl,
+                    flush_interval=config.option.pspec_jsonl_flush
+                ))
+            if config.option.pspec_shard:
+                self.sinks.append(ShardSink(config.option.pspec_shard))
+            if config.option.pspec_report:
+                self.sinks.append(ReportSink(
+                    config.option.pspec_report,
+                    document_format=config.option.pspec_report_format,
+                    characters=renderers.outcome_characters(
+                        _ini_characters(config)
+                    )
+                ))
+        self.param_folder = None
+        if config.option.pspec_group_params:
+            self.param_folder = ParamFolder(self.pattern_config.functions)
+        self.header_durations = None
+        self._block_duration = 0.0
+        self._block_specs = 0
+        self._block_outcomes = None
+        self._block_failures = []
+        if config.option.pspec_collapse:
+            self._block_outcomes = Counter()
+        self.tree = None
+        # a collapsed block is one line already
+        if config.option.pspec_tree and not config.option.pspec_collapse:
+            self.tree = PathStack()
+        if config.option.pspec_durations is not None:
+            self.header_durations = stats.HeaderDurations()
+        self.outcome_characters = renderers.outcome_characters(
+            _ini_characters(config),
+            encoding=getattr(self._tw._file, 'encoding', None)
+        )
+        self.pipeline = self._create_pipeline()
+        self.render = self.pipeline.compose()
+        self.progress = None
+        self._completed = 0
+        # the footer is redrawn in place, which needs a terminal and output
+        # written as it comes
+        if config.option.pspec_progress and self.isatty and \
+                self._buffered_file is None:
+            self.progress = ProgressFooter(self._tw)
+        self.profiler = None
+        self._restore_profiled = []
+        if config.option.pspec_profile:
+            self._start_profiling()
+
+    def _create_pipeline(self):
+        pipeline = renderers.Pipeline(renderers.outcome_renderer(
+            self.outcome_characters,
+            self.outcome_characters['default']
+        ))
+        if self.header_durations is not None:
+            pipeline.add_stage(renderers.duration_stage)
+        self.config.hook.pytest_pspec_add_stages(
+            config=self.config,
+            pipeline=pipeline
+        )
+        return pipeline
+
+    def _start_profiling(self):
+        """
+        Shadows the timed methods with timing wrappers, so the untimed
+        methods are left as they are when profiling is off.
+        """
+        profiler = self.profiler = Profiler()
+        if self.config.option.pspec_lazy_nodeids:
+            profiler.wrap_method(
+                'lazy nodeids',
+                self.nodeid_rewriter,
+                'cached_pspec_nodeid'
+            )
+        else:
+            profiler.wrap_method(
+                'pytest_collection_modifyitems',
+                self.nodeid_rewriter,
+                'rewrite'
+            )
+        profiler.wrap_method(
+            'pytest_runtest_logreport',
+            self,
+            'pytest_runtest_logreport'
+        )
+        self._restore_profiled.append(
+            profiler.patch('Node.parse', models.Node, 'parse')
+        )
+        profiler.wrap_method('renderer', self, 'render')
+        profiler.wrap_method('terminal writes', self, '_write_specs')
+
+    def _register_stats(self, report):
+        """
+        This method is not created for this plugin, but it is needed in order
+        to the reporter display the tests summary at the end.
+
+        Originally from:
+        https://github.com/pytest-dev/pytest/blob/47a2a77/_pytest/terminal.py#L198-L201
+        """
+        res = self.config.hook.pytest_report_teststatus(
+            report=report,
+            config=self.config)
+        category = res[0]
+        if self.config.option.pspec_lean_stats:
+            self._register_lean_stats(category, report)
+        else:
+            self.stats.setdefault(category, []).append(report)
+        self._tests_ran = True
+
+    def _register_lean_stats(self, category, report):
+        """
+        Passing reports are only counted, unless the short test summary was
+        asked for them, and other reports are kept without their traceback
+        objects.
+        """
+        if category == '' or category == 'passed' and not (
+                self.hasopt('p') or self.hasopt('P')):
+            reports = self.stats.get(category)
+            if reports is None:
+                reports = self.stats[category] = stats.CountedReports()
+            reports.append(report)
+        else:
+            self.stats.setdefault(category, []).append(stats.compact_report(
+                report,
+                keep_sections=category != 'passed' or self.hasopt('P')
+            ))
+
+    def pytest_collection_finish(self, session):
+        TerminalReporter.pytest_collection_finish(self, session)
+        if self.progress is not None:
+            self.progress.start(len(session.items))
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        # the footer stays on screen while a test runs, unless its output
+        # is not captured and would run into it
+        if self.progress is not None:
+            if self._uncaptured:
+                self.progress.clear()
+            else:
+                self.progress.show()
+        if self._drain_before_tests:
+            self.drain(wait=True)
+        TerminalReporter.pytest_runtest_logstart(self, nodeid, location)
+
+    def pytest_runtest_logreport(self, report):
+        self._register_stats(report)
+
+        if self.progress is not None and report.when == 'teardown':
+            self._completed += 1
+            self.progress.update(self._completed, self._last_header)
+        if self.param_folder is not None and report.when == 'teardown':
+            key = getattr(report, 'pspec_group', None)
+            if key is not None:
+                for ready in self.param_folder.finish(key):
+                    self._add_spec(ready)
+
+        if report.when != 'call' and not report.skipped:
+            return
+
+        # the variants of a parametrized function are written to the sinks
+        # under their own names, and folded under the title of the function
+        group_title = getattr(report, 'pspec_group_title', None)
+        if group_title is None or self.sinks:
+            result = self._create_result(report)
+            for sink in self.sinks:
+                sink.write(result)
+        if group_title is not None:
+            result = self._create_result(report, group_title)
+
+        if self.header_durations is not None:
+            self.header_durations.add(result.header, result.duration)
+        if self.param_folder is None:
+            self._add_spec(result)
+        else:
+            for ready in self.param_folder.add(
+                result,
+                getattr(report, 'pspec_group', None),
+                getattr(report, 'pspec_variant', None)
+            ):
+                self._add_spec(ready)
+
+        if report.failed:
+            self.drain()
+
+    def _create_result(self, report, pspec_nodeid=None):
+        if pspec_nodeid is None:
+            pspec_nodeid = getattr(report, 'pspec_nodeid', report.nodeid)
+        result = models.Result.create(
+            report,
+            self.pattern_config,
+            self.node_cache,
+            pspec_nodeid
+        )
+        if self.tree is not None:
+            result.path = self.node_cache.format_path(pspec_nodeid)
+        return result
+
+    def _add_spec(self, result):
+        header = result.header
+        if self.header_groups is None:
+            self._write_specs(header, [result])
+        else:
+            key = (result.nodeid.partition('::')[0], header)
+            results = self.header_groups.add(key, result)
+            if results is not None:
+                self._write_group(key, results)
+
+    def _write_group(self, key, results):
+        # the groups of one header in two modules are two blocks
+        new_block = key != self._last_group
+        self._last_group = key
+        self._write_specs(key[1], results, new_block)
+
+    def flush_param_folder(self):
+        if self.param_folder is None:
+            return
+
+        for result in self.param_folder.flush():
+            self._add_spec(result)
+
+    def _write_specs(self, header, results, new_block=False):
+        if self.progress is not None:
+            self.progress.clear()
+        if self.tree is not None:
+            self._write_tree_specs(header, results)
+            return
+        if new_block or header != self._last_header:
+            self.close_block()
+            self.drain()
+            self._last_header = header
+            if self._block_outcomes is None:
+                self._tw.sep(' ')
+                self._tw.line(header)
+        if self._block_outcomes is not None:
+            self._collapse_specs(results)
+            return
+
+        for result in results:
+            self._write_result(result)
+            if self.header_durations is not None:
+                self._block_duration += result.duration or 0.0
+                self._block_specs += 1
+
+    def _write_tree_specs(self, header, results):
+        tree = self.tree
+        self._last_header = header
+        for result in results:
+            if result.path != tree.path:
+                self.close_block()
+                self.drain()
+                depth, lines = tree.push(result.path)
+                if depth == 0:
+                    self._tw.sep(' ')
+                for line in lines:
+                    self._tw.line(line)
+
+            self._write_result(result, tree.spec_indent)
+            if self.header_durations is not None:
+                self._block_duration += result.duration or 0.0
+                self._block_specs += 1
+
+    def _write_result(self, result, indent=''):
+        render = self.render
+        self._tw.line(indent + render(result))
+        for variant in getattr(result, 'failed_variants', ()):
+            self._tw.line(indent + render(variant))
+
+    def _collapse_specs(self, results):
+        for result in results:
+            counts = getattr(result, 'counts', None)
+            if counts is None:
+                self._block_outcomes[result.outcome] += 1
+            else:
+                self._block_outcomes.update(counts)
+            if result.outcome == 'failed':
+                self._block_failures.append(result)
+            if self.header_durations is not None:
+                self._block_duration += result.duration or 0.0
+
+    def close_block(self):
+        """
+        Writes the end of the header block written last: its summary line and
+        failed specs with ``--pspec-collapse``, and its total duration with
+        ``--pspec-durations``.
+        """
+        if self._block_outcomes is not None:
+            self._close_collapsed_block()
+            return
+
+        if not self._block_specs:
+            return
+
+        indent = self.tree.spec_indent if self.tree is not None else ''
+        self._tw.line('{}   {} specs in {:.2f}s'.format(
+            indent,
+            self._block_specs,
+            self._block_duration
+        ))
+        self._block_duration = 0.0
+        self._block_specs = 0
+
+    def _close_collapsed_block(self):
+        outcomes = self._block_outcomes
+        if not outcomes:
+            return
+
+        summary = stats.format_outcomes(outcomes)
+        if self.header_durations is not None:
+            summary = '{} in {:.2f}s'.format(summary, self._block_duration)
+        self.ensure_newline()
+        self._tw.line('{}  {}'.format(self._last_header, summary))
+        for result in self._block_failures:
+            self._write_result(result)
+
+        outcomes.clear()
+        self._block_failures = []
+        self._block_duration = 0.0
+
+    def expect_nodeids(self, nodeids):
+        """
+        Lets the xdist header groups know how many specs each header of each
+        module holds, out of the nodeids collected by a worker. Those are
+        only pspec names when they were rewritten at collection time.
+        """
+        if self.progress is not None and self.progress.total is None:
+            self.progress.start(len(nodeids))
+        if self.param_folder is not None and \
+                self.param_folder.expected is None:
+            keys = [function_key(nodeid) for nodeid in nodeids]
+            self.param_folder.expect(key for key in keys if key is not None)
+        if self.header_groups is None or \
+                self.header_groups.expected is not None or \
+                self.config.option.pspec_lazy_nodeids or \
+                self.param_folder is not None:
+            return
+
+        self.header_groups.expect(
+            (
+                nodeid.partition('::')[0],
+                models.Node.parse(nodeid, self.pattern_config, self.node_cache)
+                .header
+            )
+            for nodeid in nodeids
+        )
+
+    def release_groups(self):
+        if self.header_groups is None:
+            return
+
+        for key, results in self.header_groups.pop_all():
+            self._write_group(key, results)
+
+    def pytest_keyboard_interrupt(self, excinfo):
+        TerminalReporter.pytest_keyboard_interrupt(self, excinfo)
+        self.drain(wait=True)
+
+    def pytest_unconfigure(self):
+        TerminalReporter.pytest_unconfigure(self)
+        self.drain()
+        if self._threaded_file is not None:
+            self._threaded_file.close()
+        for sink in self.sinks:
+            sink.close()
+        while self._restore_profiled:
+            self._restore_profiled.pop()()
+
+    def drain(self, wait=False):
+        """
+        Push out pspec output held back by ``--pspec-buffer``. With ``wait``,
+        also wait for the ``--pspec-async`` thread to write it.
+        """
+        if self._buffered_file is not None:
+            self._buffered_file.drain()
+        if wait and self._threaded_file is not None:
+            self._threaded_file.drain()
+
+    def summary_durations(self):
+        if self.header_durations is None or not self.header_durations:
+            return
+
+        slowest = self.header_durations.slowest(
+            self.config.option.pspec_durations or len(self.header_durations)
+        )
+        self.write_sep('=', 'slowest {} pspec headers'.format(len(slowest)))
+        for header, duration, count in slowest:
+            self.write_line('{:.2f}s {} specs  {}'.format(
+                duration,
+                count,
+                header
+            ))
+
+    def summary_cache(self):
+        if self.verbosity < 1:
+            return
+
+        self.write_sep('-', 'pspec cache')
+        for name, cache in (
+            ('module names', self.node_cache.module_names),
+            ('class names', self.node_cache.class_names),
+        ):
+            self.write_line('{}: {} hits, {} misses, {} cached'.format(
+                name,
+                cache.hits,
+                cache.misses,
+                len(cache)
+            ))
+
+    def summary_profile(self):
+        if self.profiler is None:
+            return
+
+        self.write_sep('-', 'pspec profile')
+        for name, calls, total, p50, p99 in self.profiler.summary():
+            self.write_line(
+                '{}: {} calls, {:.3f}ms total, p50 {:.1f}us, p99 {:.1f}us'
+                .format(name, calls, total * 1e3, p50 * 1e6, p99 * 1e6)
+            )
+        if self.config.option.pspec_profile_file:
+            self.profiler.write(self.config.option.pspec_profile_file)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import heapq
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from . import documents
+from .records import Record, read_records, write_records
+
+
+class JsonLinesSink(object):
+    """
+    Streams one JSON record per result to ``path`` while the run goes on.
+
+    Records only go through the file's own buffer, which is flushed at most
+    once every ``flush_interval`` seconds.
+    """
+
+    def __init__(self, path, flush_interval=1.0, clock=time.monotonic):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._file = io.open(path, 'w', encoding='utf-8')
+        self._flushed_at = clock()
+
+    def write(self, result):
+        self._file.write(json.dumps({
+            'header': result.header,
+            'title': result.node.title,
+            'outcome': result.outcome,
+            'duration': result.duration,
+            'nodeid': result.nodeid,
+        }, ensure_ascii=False))
+        self._file.write('\n')
+
+        now = self._clock()
+        if now - self._flushed_at >= self.flush_interval:
+            self._file.flush()
+            self._flushed_at = now
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ShardSink(object):
+    """
+    Writes the results of a run to ``path`` as a shard sorted for
+    ``records.merge``.
+
+    At most ``chunk_size`` records are held in memory: full chunks are
+    sorted and spilled to temporary files next to ``path``, which are merged
+    into the shard when it is closed.
+    """
+
+    def __init__(self, path, chunk_size=100000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._chunk = []
+        self._runs = []
+        self._tmpdir = None
+        self._closed = False
+
+    def write(self, result):
+        self._chunk.append(Record.from_result(result))
+        if len(self._chunk) >= self.chunk_size:
+            self._spill()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        key = self._sort_key
+        self._chunk.sort(key=key)
+        runs = [self._chunk] + [read_records(run) for run in self._runs]
+        try:
+            self._write(record for _, record in heapq.merge(
+                *[((key(record), record) for record in run) for run in runs]
+            ))
+        finally:
+            self._chunk = []
+            if self._tmpdir is not None:
+                shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _sort_key(self, record):
+        return record
+
+    def _write(self, records):
+        write_records(self.path, records)
+
+    def _spill(self):
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(
+                prefix='pspec-spool-',
+                dir=os.path.dirname(os.path.abspath(self.path))
+            )
+        run = os.path.join(self._tmpdir, '{}.jsonl'.format(len(self._runs)))
+        self._chunk.sort(key=self._sort_key)
+        write_records(run, self._chunk)
+        self._runs.append(run)
+        self._chunk = []
+
+
+class ReportSink(ShardSink):
+    """
+    Spools the results of a run the way ``ShardSink`` does and writes them
+    to ``path`` as a ``documents`` document when it is closed, by module
+    file in the order they were collected in, whatever order they ran in.
+    """
+
+    def __init__(self, path, document_format=None, characters=None,
+                 chunk_size=100000):
+        super(ReportSink, self).__init__(path, chunk_size=chunk_size)
+        self.document_format = (
+            document_format or documents.format_for_path(path)
+        )
+        self.characters = characters
+
+    def _sort_key(self, record):
+        return record.path, record.index
+
+    def _write(self, records):
+        with io.open(self.path, 'w', encoding='utf-8') as out:
+            documents.write_document(
+                records,
+                out,
+                self.document_format,
+                self.characters
+            )
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import copy
+import heapq
+import itertools
+
+#: Characters kept of a failure's traceback and captured output sections.
+LONGREPR_LIMIT = 4000
+
+
+#: Order of the outcomes in summaries, other outcomes come after.
+OUTCOME_ORDER = ('passed', 'failed', 'skipped')
+
+
+def format_outcomes(counts):
+    """
+    Returns ``'5 passed, 1 failed'`` out of a mapping of outcome counts.
+    """
+    return ', '.join(
+        '{} {}'.format(counts[outcome], outcome)
+        for outcome in sorted(counts, key=_outcome_order)
+        if counts[outcome]
+    )
+
+
+def _outcome_order(outcome):
+    try:
+        return OUTCOME_ORDER.index(outcome), outcome
+    except ValueError:
+        return len(OUTCOME_ORDER), outcome
+
+
+class CountedReport(object):
+    """
+    What a ``CountedReports`` list yields in place of the reports it only
+    counted.
+    """
+    count_towards_summary = True
+    nodeid = ''
+    when = 'call'
+    longrepr = None
+    sections = ()
+
+
+COUNTED_REPORT = CountedReport()
+
+
+class CountedReports(object):
+    """
+    Stands in for a list of reports in ``TerminalReporter.stats`` when only
+    their number is needed: appending a report only counts it.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        return itertools.repeat(COUNTED_REPORT, self.count)
+
+    def append(self, report):
+        self.count += 1
+
+    def extend(self, reports):
+        self.count += len(reports)
+
+
+class HeaderDurations(object):
+    """
+    Running totals of the spec durations under each header, so the slowest
+    headers are known without keeping the reports around.
+    """
+
+    def __init__(self):
+        self._totals = {}
+
+    def __len__(self):
+        return len(self._totals)
+
+    def add(self, header, duration):
+        total = self._totals.get(header)
+        if total is None:
+            total = self._totals[header] = [0.0, 0]
+        total[0] += duration or 0.0
+        total[1] += 1
+
+    def slowest(self, n):
+        """
+        Returns the ``(header, duration, count)`` of the ``n`` headers which
+        took the longest, slowest first.
+        """
+        return [
+            (header, duration, count)
+            for header, (duration, count) in heapq.nlargest(
+                n,
+                self._totals.items(),
+                key=lambda item: item[1][0]
+            )
+        ]
+
+
+class CompactLongRepr(object):
+    """
+    A truncated, plain text rendering of a report's longrepr which keeps its
+    crash summary for the short test summary.
+    """
+
+    def __init__(self, text, reprcrash=None):
+        self.text = text
+        self.reprcrash = reprcrash
+
+    def __str__(self):
+        return self.text
+
+    def toterminal(self, tw):
+        tw.line(self.text)
+
+
+def compact_report(report, keep_sections=True):
+    """
+    Returns a copy of ``report`` holding a truncated longrepr and captured
+    output, and no reference to the original traceback objects.
+    """
+    compact = copy.copy(report)
+    longrepr = report.longrepr
+    if longrepr is not None and not isinstance(longrepr, tuple):
+        compact.longrepr = CompactLongRepr(
+            _truncate(str(longrepr)),
+            getattr(longrepr, 'reprcrash', None)
+        )
+    if keep_sections:
+        compact.sections = [
+            (name, _truncate(content)) for name, content in report.sections
+        ]
+    else:
+        compact.sections = []
+    return compact
+
+
+def _truncate(text):
+    if len(text) <= LONGREPR_LIMIT:
+        return text
+    return '{}\n... ({} characters truncated)'.format(
+        text[:LONGREPR_LIMIT],
+        len(text) - LONGREPR_LIMIT
+    )
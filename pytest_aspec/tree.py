@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+
+class PathStack(object):
+    """
+    The path of headers, module first, of the spec written last, so that a
+    new spec only prints the part of its path that differs, indented by
+    depth, instead of a flat header every time the header changes.
+    """
+
+    def __init__(self, indent='  '):
+        self.indent = indent
+        self.path = ()
+
+    def push(self, path):
+        """
+        Makes ``path`` the current path and returns the depth at which it
+        departs from the previous one along with the header lines to write,
+        in O(depth).
+        """
+        depth = 0
+        for previous, current in zip(self.path, path):
+            if previous != current:
+                break
+            depth += 1
+        self.path = path
+        return depth, [
+            self.indent * index + path[index]
+            for index in range(depth, len(path))
+        ]
+
+    @property
+    def spec_indent(self):
+        """
+        The indentation of the specs under the current path.
+        """
+        return self.indent * (len(self.path) - 1)
+
+    def reset(self):
+        self.path = ()
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 
 
 class Wrapper(object):
+    __slots__ = ('wrapped',)
 
     def __init__(self, wrapped):
         self.wrapped = wrapped
@@ -19,6 +20,7 @@ class OutcomeCharacters:
 
 
 class UnicodeWrapper(Wrapper):
+    __slots__ = ()
 
     def __str__(self):
         outcome = getattr(
@@ -29,3 +31,4 @@ class UnicodeWrapper(Wrapper):
             outcome=outcome,
             node=self.wrapped.node
         )
+
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import os
+import threading
+
+from six.moves import queue
+
+
+class BufferedFile(object):
+    """
+    Holds the text written to a terminal file until ``size`` lines are
+    pending, then writes and flushes them in one go.
+
+    Flushes requested by the terminal writer are ignored, ``drain`` is the
+    only way to push pending text out before the buffer fills up.
+    """
+
+    def __init__(self, file, size):
+        self.file = file
+        self.size = size
+        self._chunks = []
+        self._pending_lines = 0
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def write(self, text):
+        self._chunks.append(text)
+        self._pending_lines += text.count('\n')
+        if self._pending_lines >= self.size:
+            self.drain()
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        if self._chunks:
+            chunks, self._chunks = self._chunks, []
+            self._pending_lines = 0
+            try:
+                self.file.write(''.join(chunks))
+            except UnicodeEncodeError:
+                for chunk in chunks:
+                    _write_escaped(self.file, chunk)
+        self.file.flush()
+
+
+class ThreadedFile(object):
+    """
+    Hands the text written to a terminal file over to a writer thread through
+    a queue of ``size`` chunks, so a slow pipe or log file doesn't hold up
+    the tests.
+
+    Text is written in order, along with the flushes requested in between.
+    Once the queue is full, writing blocks until the thread catches up.
+    ``drain`` waits for everything queued to be written and ``close`` stops
+    the thread, after which text is written straight to the file. Errors
+    raised by the thread are raised again by the next call.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, file, size):
+        self.file = file
+        self.closed = False
+        self._error = None
+        self._output = _duplicate(file)
+        self._queue = queue.Queue(size)
+        self._thread = threading.Thread(target=self._run, name='pspec-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def write(self, text):
+        if self.closed:
+            return self.file.write(text)
+        self._raise_error()
+        self._queue.put(text)
+        return len(text)
+
+    def flush(self):
+        if self.closed:
+            self.file.flush()
+        else:
+            self._raise_error()
+            self._queue.put(self._FLUSH)
+
+    def drain(self):
+        if not self.closed:
+            self._queue.join()
+            self._raise_error()
+
+    def close(self):
+        if self.closed:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self.closed = True
+        if self._output is not self.file:
+            self._output.close()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            # whatever else is queued by now is written in one go
+            items = [self._queue.get()]
+            try:
+                while True:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            chunks = [
+                item for item in items
+                if item is not self._FLUSH and item is not self._STOP
+            ]
+            try:
+                if chunks:
+                    try:
+                        self._output.write(''.join(chunks))
+                    except UnicodeEncodeError:
+                        for chunk in chunks:
+                            _write_escaped(self._output, chunk)
+                if len(chunks) < len(items):
+                    self._output.flush()
+            except Exception as error:
+                self._error = error
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+            if items[-1] is self._STOP:
+                return
+
+
+def _duplicate(file):
+    """
+    Opens a duplicate of the descriptor of ``file`` to write to from the
+    writer thread. pytest points the descriptor of stdout to a temporary
+    file while it captures the output of a test, which is when the thread
+    writes. Files without a descriptor are written to as they are.
+    """
+    try:
+        fd = file.fileno()
+    except (AttributeError, ValueError, EnvironmentError):
+        return file
+    file.flush()
+    return io.open(
+        os.dup(fd), 'w',
+        encoding=getattr(file, 'encoding', None) or 'utf-8',
+        errors=getattr(file, 'errors', None) or 'strict'
+    )
+
+
+def _write_escaped(file, text):
+    """
+    Same fallback as pytest's TerminalWriter: text the file can't encode is
+    written escaped to ASCII instead.
+    """
+    try:
+        file.write(text)
+    except UnicodeEncodeError:
+        file.write(text.encode('unicode-escape').decode('ascii'))
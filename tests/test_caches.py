@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_aspec.caches import LRUCache
+
+
+class TestLRUCache(object):
+
+    @pytest.fixture
+    def cache(self):
+        return LRUCache(maxsize=2)
+
+    def test_should_compute_a_missing_value_once(self, cache):
+        calls = []
+
+        def factory(key):
+            calls.append(key)
+            return key.upper()
+
+        assert cache.get('a', factory) == 'A'
+        assert cache.get('a', factory) == 'A'
+        assert calls == ['a']
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_should_evict_the_least_recently_used_entry(self, cache):
+        cache.get('a', str.upper)
+        cache.get('b', str.upper)
+        cache.get('a', str.upper)
+        cache.get('c', str.upper)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert len(cache) == 2
+
+    def test_should_not_store_anything_when_disabled(self):
+        cache = LRUCache(maxsize=0)
+
+        assert cache.get('a', str.upper) == 'A'
+        assert cache.get('a', str.upper) == 'A'
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_should_never_evict_when_unbounded(self):
+        cache = LRUCache()
+
+        for key in 'abcdef':
+            cache.get(key, str.upper)
+
+        assert len(cache) == 6
+
+    def test_clear_should_reset_entries_and_counters(self, cache):
+        cache.get('a', str.upper)
+        cache.get('a', str.upper)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (0, 0)
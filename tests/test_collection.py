@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from pytest_aspec.collection import NodeIdRewriter, StoredNames
+
+
+class TestNodeIdRewriter(object):
+
+    @pytest.fixture
+    def items(self, testdir):
+        return testdir.getitems("""
+            import pytest
+
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_documented(self):
+                    "it is documented"
+
+                @pytest.mark.parametrize('value', [1, 2])
+                def test_parametrized(self, value):
+                    "it takes {value}"
+
+            class TestBar(object):
+                def test_bar(self):
+                    pass
+
+            def test_function():
+                pass
+        """)
+
+    def test_rewrite_should_use_docstrings(self, items):
+        NodeIdRewriter().rewrite(items)
+
+        assert [item.nodeid.split('::', 1)[1] for item in items] == [
+            'Foo spec::it is documented',
+            'Foo spec::it takes 1',
+            'Foo spec::it takes 2',
+            'TestBar::test_bar',
+            '::test_function',
+        ]
+
+    def test_pspec_nodeid_should_not_modify_the_item(self, items):
+        nodeids = [item.nodeid for item in items]
+        rewriter = NodeIdRewriter()
+
+        rewritten = [rewriter.pspec_nodeid(item) for item in items]
+
+        assert [item.nodeid for item in items] == nodeids
+        assert rewritten[0].endswith('::Foo spec::it is documented')
+
+    def test_group_nodeid_should_not_format_the_docstring(self, items):
+        rewriter = NodeIdRewriter()
+
+        assert rewriter.group_nodeid(items[1]).endswith(
+            '::Foo spec::it takes {value}'
+        )
+        assert rewriter.group_nodeid(items[3]).endswith('::test_bar')
+
+    def test_rewrite_should_leave_variants_when_grouping(self, items):
+        nodeids = [item.nodeid for item in items]
+
+        NodeIdRewriter().rewrite(items, group_params=True)
+
+        assert [item.nodeid for item in items][1:3] == nodeids[1:3]
+        assert items[0].nodeid.endswith('::Foo spec::it is documented')
+
+    def test_rewrite_should_name_nested_classes(self, testdir):
+        items = testdir.getitems("""
+            import pytest
+
+            class TestOuter(object):
+                "Outer spec"
+
+                class TestInner(object):
+                    def test_inner(self):
+                        "it reads a::b"
+
+                    @pytest.mark.parametrize('value', ['x::y'])
+                    def test_value(self, value):
+                        pass
+        """)
+
+        NodeIdRewriter().rewrite(items)
+
+        assert [item.nodeid.split('::', 1)[1] for item in items] == [
+            'Outer spec::TestInner::it reads a:b',
+            'Outer spec::TestInner::test_value[x:y]',
+        ]
+
+    def test_should_raise_on_missing_format_keys(self, testdir):
+        items = testdir.getitems("""
+            import pytest
+
+            @pytest.mark.parametrize('value', [1])
+            def test_parametrized(value):
+                "it takes {missing}"
+        """)
+
+        with pytest.raises(KeyError):
+            NodeIdRewriter().rewrite(items)
+
+
+class FakeCache(object):
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class TestStoredNames(object):
+
+    @pytest.fixture
+    def items(self, testdir):
+        return testdir.getitems("""
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_documented(self):
+                    "it is documented"
+        """)
+
+    @pytest.fixture
+    def cache(self):
+        return FakeCache()
+
+    def rewrite(self, items, cache):
+        nodeids = [item.nodeid for item in items]
+        for item, nodeid in zip(items, nodeids):
+            item._nodeid = nodeid
+        stored_names = StoredNames(cache)
+        NodeIdRewriter().rewrite(items, stored_names)
+        stored_names.save()
+        rewritten = [item.nodeid for item in items]
+        for item, nodeid in zip(items, nodeids):
+            item._nodeid = nodeid
+        return rewritten
+
+    def test_should_store_the_names_per_module(self, items, cache):
+        rewritten = self.rewrite(items, cache)
+
+        path = str(items[0].fspath)
+        module = cache.data[StoredNames.key][path]
+        assert module['mtime'] == os.stat(path).st_mtime
+        assert module['names'] == {items[0].nodeid: rewritten[0]}
+
+    def test_should_reuse_the_names_of_unchanged_modules(self, items, cache):
+        self.rewrite(items, cache)
+        path = str(items[0].fspath)
+        names = cache.data[StoredNames.key][path]['names']
+        names[items[0].nodeid] = 'stored::name'
+
+        assert self.rewrite(items, cache) == ['stored::name']
+
+    def test_should_compute_the_names_of_changed_modules(self, items, cache):
+        self.rewrite(items, cache)
+        path = str(items[0].fspath)
+        cache.data[StoredNames.key][path]['names'][items[0].nodeid] = 'stale'
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert self.rewrite(items, cache)[0].endswith(
+            '::Foo spec::it is documented'
+        )
+
+    def test_should_not_save_when_nothing_changed(self, items, cache):
+        self.rewrite(items, cache)
+        stored_names = StoredNames(cache)
+        NodeIdRewriter().rewrite(items, stored_names)
+
+        assert not stored_names.changed
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+from pytest_aspec.documents import format_for_path, write_document
+
+from .test_records import record
+
+
+@pytest.fixture
+def records():
+    return [
+        record('a.py', '', 1, 'works'),
+        record('a.py', 'Foo', 5, 'reads <b>', 'failed'),
+        record('a.py', 'Foo', 9, 'writes_*'),
+        record('b.py', 'Foo', 2, 'skips', 'skipped'),
+    ]
+
+
+def write(records, document_format):
+    out = io.StringIO()
+    counts = write_document(
+        records,
+        out,
+        document_format,
+        {'passed': '+', 'failed': '-', 'skipped': '?', 'default': '.'}
+    )
+    return out.getvalue(), counts
+
+
+class TestWriteDocument(object):
+
+    def test_text_should_group_specs_by_module_and_class(self, records):
+        text, counts = write(records, 'text')
+
+        assert text == (
+            '\na\n=\n + works\n'
+            '\nFoo\n - reads <b>\n + writes_*\n'
+            '\nb\n=\n'
+            '\nFoo\n ? skips\n'
+            '\n2 passed, 1 failed, 1 skipped\n'
+        )
+        assert counts == {'passed': 2, 'failed': 1, 'skipped': 1}
+
+    def test_should_write_the_module_again_after_a_class(self):
+        text, _ = write([
+            record('a.py', 'Foo', 1, 'reads'),
+            record('a.py', '', 5, 'works'),
+        ], 'text')
+
+        assert text.startswith(
+            '\na\n=\n'
+            '\nFoo\n + reads\n'
+            '\na\n + works\n'
+        )
+
+    def test_markdown_should_escape_titles(self, records):
+        text, _ = write(records, 'markdown')
+
+        assert text.startswith('# pspec report\n\n## a\n\n- + works\n')
+        assert '\n### Foo\n\n- - reads \\<b\\>\n- + writes\\_\\*\n' in text
+        assert text.endswith('\n**2 passed, 1 failed, 1 skipped**\n')
+
+    def test_html_should_escape_titles(self, records):
+        text, _ = write(records, 'html')
+
+        assert '<h2>a</h2>\n<ul>\n<li class="passed">+ works</li>\n</ul>\n' \
+            in text
+        assert '<li class="failed">- reads &lt;b&gt;</li>' in text
+        assert text.endswith(
+            '<p class="summary">2 passed, 1 failed, 1 skipped</p>\n'
+            '</body>\n</html>\n'
+        )
+
+    def test_should_write_a_document_without_specs(self):
+        text, counts = write([], 'text')
+
+        assert text == '\nno specs\n'
+        assert not counts
+
+
+@pytest.mark.parametrize('path,document_format', (
+    ('report.md', 'markdown'),
+    ('report.HTML', 'html'),
+    ('report.txt', 'text'),
+    ('report', 'text'),
+))
+def test_format_for_path(path, document_format):
+    assert format_for_path(path) == document_format
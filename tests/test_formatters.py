@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import random
+import string
+
 import pytest
 
 from pytest_aspec import formatters
@@ -43,6 +46,8 @@ class TestFormatClassName(object):
     @pytest.mark.parametrize('class_name,expected', (
         ('SimpleHTTPServer', 'Simple HTTP Server'),
         ('MyAPI', 'My API'),
+        ('HTTPServerV2', 'HTTP Server V2'),
+        ('OAuth2Token', 'O Auth2 Token'),
     ))
     def test_should_not_split_letters_in_an_abbreviation(
         self,
@@ -53,6 +58,52 @@ class TestFormatClassName(object):
         formatted = formatters.format_class_name(class_name, patterns)
         assert formatted == expected
 
+    def test_should_keep_names_with_spaces(self, patterns):
+        formatted = formatters.format_class_name('A DocString', patterns)
+        assert formatted == 'A DocString'
+
+    def test_should_format_like_the_quadratic_implementation(self):
+        alphabet = string.ascii_letters + string.digits + '_ \u00e9\u00c9'
+        rng = random.Random(20240607)
+        patterns = ['Test*', '*Spec']
+        pattern_set = formatters.PatternSet(patterns)
+
+        for _ in range(2000):
+            class_name = ''.join(
+                rng.choice(alphabet) for _ in range(rng.randint(0, 40))
+            )
+            expected = legacy_format_class_name(class_name, patterns)
+
+            assert formatters.format_class_name(
+                class_name,
+                patterns
+            ) == expected
+            assert formatters.format_class_name(
+                class_name,
+                pattern_set
+            ) == expected
+
+
+def legacy_format_class_name(class_name, patterns):
+    formatted = ''
+
+    class_name = formatters._remove_patterns(class_name, patterns)
+    if ' ' not in class_name:
+        for index, letter in enumerate(class_name):
+            letter_before = class_name[index - 1] if index > 0 else ''
+            letter_after = (
+                class_name[index + 1] if index < len(class_name) - 1 else ''
+            )
+            if letter.isupper() and \
+                    (letter_before.islower() or letter_after.islower()):
+                formatted += ' '
+
+            formatted += letter
+    else:
+        formatted = class_name
+
+    return formatted.strip()
+
 
 class TestFormatModuleName(object):
 
@@ -91,3 +142,40 @@ class TestFormatModuleName(object):
         )
 
         assert formatted == 'module'
+
+
+class TestPatternSet(object):
+
+    @pytest.mark.parametrize('patterns,statement,expected', (
+        (['test*'], 'test_a_thing', '_a_thing'),
+        (['*test'], 'a_thing_test', 'a_thing_'),
+        (['test_*.py'], 'test_module.py', 'module'),
+        (['test*', 'check*'], 'check_test_a', '_test_a'),
+        (['test*', '*_spec'], 'test_a_spec', '_a'),
+        (['test*', 'test*'], 'testtest_a', '_a'),
+        (['Test*', 'Describe*'], 'AThing', 'AThing'),
+        ([], 'test_a', 'test_a'),
+    ))
+    def test_should_remove_patterns_in_order(
+        self,
+        patterns,
+        statement,
+        expected
+    ):
+        pattern_set = formatters.PatternSet(patterns)
+
+        assert pattern_set.remove(statement) == expected
+        assert formatters._remove_patterns(statement, patterns) == expected
+
+    def test_should_be_accepted_by_the_formatters(self):
+        pattern_set = formatters.PatternSet(['test_*.py'])
+
+        assert formatters.format_module_name(
+            'tests/test_module.py',
+            pattern_set
+        ) == 'module'
+
+    def test_compile_patterns_should_reuse_a_pattern_set(self):
+        pattern_set = formatters.PatternSet(['test*'])
+
+        assert formatters.compile_patterns(pattern_set) is pattern_set
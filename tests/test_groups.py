@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_aspec.groups import HeaderGroups, ParamFolder, function_key
+from pytest_aspec.models import FoldedResult, Node, Result
+
+
+class TestHeaderGroups(object):
+
+    @pytest.fixture
+    def groups(self):
+        return HeaderGroups(max_lines=3)
+
+    def test_should_hold_lines_until_the_group_is_full(self, groups):
+        assert groups.add('Foo', 'one') is None
+        assert groups.add('Bar', 'two') is None
+        assert groups.add('Foo', 'three') is None
+        assert groups.add('Foo', 'four') == ['one', 'three', 'four']
+
+    def test_should_release_a_group_once_every_spec_was_reported(
+        self,
+        groups
+    ):
+        groups.expect(['Foo', 'Bar', 'Foo'])
+
+        assert groups.add('Foo', 'one') is None
+        assert groups.add('Bar', 'two') == ['two']
+        assert groups.add('Foo', 'three') == ['one', 'three']
+
+    def test_pop_all_should_release_pending_groups_in_order(self, groups):
+        groups.add('Foo', 'one')
+        groups.add('Bar', 'two')
+        groups.add('Foo', 'three')
+
+        assert groups.pop_all() == [
+            ('Foo', ['one', 'three']),
+            ('Bar', ['two']),
+        ]
+        assert groups.pop_all() == []
+
+
+def result(outcome, title='takes {value}', nodeid='t.py::test_takes[0]'):
+    return Result(
+        outcome,
+        Node(title, 'Amounts', 't'),
+        duration=0.25,
+        nodeid=nodeid
+    )
+
+
+class TestParamFolder(object):
+
+    @pytest.fixture
+    def folder(self):
+        return ParamFolder(['test*'])
+
+    def test_should_fold_the_variants_of_a_function(self, folder):
+        assert folder.add(result('passed'), 't.py::test_takes') == []
+        assert folder.add(
+            result('failed', nodeid='t.py::test_takes[1]'),
+            't.py::test_takes',
+            'takes 1'
+        ) == []
+        assert folder.add(result('skipped'), 't.py::test_takes') == []
+
+        folded, = folder.flush()
+
+        assert isinstance(folded, FoldedResult)
+        assert folded.outcome == 'failed'
+        assert folded.nodeid == 't.py::test_takes'
+        assert folded.duration == 0.75
+        assert folded.node.title == (
+            'takes {value} (1 passed, 1 failed, 1 skipped)'
+        )
+        assert [variant.node.title for variant in folded.failed_variants] == [
+            '  takes 1'
+        ]
+        assert folder.flush() == []
+
+    def test_should_name_failed_variants_after_their_nodeid(self, folder):
+        folder.add(
+            result('failed', nodeid='t.py::test_takes[2]'),
+            't.py::test_takes'
+        )
+
+        folded, = folder.flush()
+
+        assert folded.failed_variants[0].node.title == '  takes[2]'
+
+    def test_should_release_a_function_once_its_variants_finished(
+        self,
+        folder
+    ):
+        folder.expect([
+            't.py::test_takes',
+            't.py::test_other',
+            't.py::test_takes',
+        ])
+
+        folder.add(result('passed'), 't.py::test_takes')
+        assert folder.finish('t.py::test_takes') == []
+        folder.add(result('failed'), 't.py::test_other')
+        assert [r.node.title for r in folder.finish('t.py::test_other')] == [
+            'takes {value} (1 failed)'
+        ]
+        folder.add(result('passed'), 't.py::test_takes')
+        ready = folder.finish('t.py::test_takes')
+
+        assert [r.node.title for r in ready] == ['takes {value} (2 passed)']
+        assert folder.flush() == []
+
+    def test_should_count_variants_which_were_not_reported(self, folder):
+        folder.expect(['t.py::test_takes', 't.py::test_takes'])
+
+        folder.add(result('passed'), 't.py::test_takes')
+        folder.finish('t.py::test_takes')
+        # the second variant failed to set up
+        ready = folder.finish('t.py::test_takes')
+
+        assert [r.node.title for r in ready] == ['takes {value} (1 passed)']
+
+    def test_flush_should_release_functions_in_order(self, folder):
+        folder.add(result('passed'), 't.py::test_takes')
+        folder.add(result('passed'), 't.py::test_other')
+        folder.add(result('passed'), 't.py::test_takes')
+
+        assert folder.finish('t.py::test_takes') == []
+        assert [r.nodeid for r in folder.flush()] == [
+            't.py::test_takes',
+            't.py::test_other',
+        ]
+
+    def test_should_pass_results_which_are_not_parametrized(self, folder):
+        plain = result('passed', title='plain')
+
+        assert folder.add(plain) == [plain]
+
+
+@pytest.mark.parametrize('nodeid,key', (
+    ('t.py::TestFoo::test_takes[1-2]', 't.py::TestFoo::test_takes'),
+    ('t.py::test_takes[a::b]', 't.py::test_takes'),
+    ('t.py::TestOuter::TestInner::test_takes[[0]]',
+     't.py::TestOuter::TestInner::test_takes'),
+    ('t.py::TestFoo::test_plain', None),
+))
+def test_function_key(nodeid, key):
+    assert function_key(nodeid) == key
@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import tracemalloc
+
 import pytest
 
 from pytest_aspec import formatters
-from pytest_aspec.models import Node, PatternConfig, Result
+from pytest_aspec.models import (
+    Node,
+    NodeCache,
+    NodePath,
+    PatternConfig,
+    Result
+)
 
 
 @pytest.fixture
@@ -51,6 +59,24 @@ class TestNode(object):
 
         assert node.class_name == class_name
 
+    def test_parse_should_join_nested_classes(self, pattern_config):
+        node = Node.parse(
+            'tests/test_module.py::TestOuter::Inner spec::it works',
+            pattern_config
+        )
+
+        assert node.class_name == 'Outer Inner spec'
+        assert node.title == 'it works'
+
+    def test_parse_should_keep_brackets_in_titles(self, pattern_config):
+        node = Node.parse(
+            'tests/test_module.py::Foo [beta]::it reads a[0]',
+            pattern_config
+        )
+
+        assert node.class_name == 'Foo [beta]'
+        assert node.title == 'it reads a[0]'
+
     def test_repr_should_return_a_string_representation_of_itself(self, node):
         from_repr = eval(repr(node))
 
@@ -59,6 +85,89 @@ class TestNode(object):
         assert from_repr.module_name == node.module_name
 
 
+class TestNodePath(object):
+
+    @pytest.mark.parametrize('nodeid,expected', (
+        ('test_module.py', ('test_module.py', (), '', None)),
+        ('test_module.py::test', ('test_module.py', (), 'test', None)),
+        (
+            'tests/test_module.py::TestFoo::test',
+            ('tests/test_module.py', ('TestFoo',), 'test', None)
+        ),
+        (
+            'test_module.py::TestOuter::TestInner::test',
+            ('test_module.py', ('TestOuter', 'TestInner'), 'test', None)
+        ),
+        (
+            'test_module.py::TestFoo::()::test',
+            ('test_module.py', ('TestFoo',), 'test', None)
+        ),
+        (
+            'test_module.py::TestFoo::test[a::b-[c]]',
+            ('test_module.py', ('TestFoo',), 'test', 'a::b-[c]')
+        ),
+        (
+            'test_[x]/test_module.py::test[1]',
+            ('test_[x]/test_module.py', (), 'test', '1')
+        ),
+    ))
+    def test_parse_should_tokenize_nodeids(self, nodeid, expected):
+        assert NodePath.parse(nodeid) == expected
+
+    def test_parse_without_params_should_keep_brackets(self):
+        path = NodePath.parse('test_module.py::Foo::a[0]', params=False)
+
+        assert path.function == 'a[0]'
+        assert path.param_id is None
+
+    def test_name_should_include_the_param_id(self):
+        assert NodePath.parse('m.py::test[a::b]').name == 'test[a::b]'
+        assert NodePath.parse('m.py::test').name == 'test'
+
+
+class TestNodeCache(object):
+
+    @pytest.fixture
+    def cache(self):
+        pattern_config = PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        ).compile()
+        return NodeCache(pattern_config, maxsize=8)
+
+    def test_parse_should_format_components_once(self, cache):
+        for title in ('test_one', 'test_two', 'test_three'):
+            Node.parse(
+                'tests/test_module.py::TestClassName::{}'.format(title),
+                cache.pattern_config,
+                cache
+            )
+
+        assert (cache.module_names.hits, cache.module_names.misses) == (2, 1)
+        assert (cache.class_names.hits, cache.class_names.misses) == (2, 1)
+
+    def test_format_path_should_format_each_class(self, cache):
+        assert cache.format_path(
+            'tests/test_module.py::TestOuter::Inner spec::it works'
+        ) == (
+            cache.format_module_name('tests/test_module.py'),
+            'Outer',
+            'Inner spec',
+        )
+        assert cache.format_path('tests/test_module.py::::it works') == (
+            cache.format_module_name('tests/test_module.py'),
+        )
+
+    def test_parse_should_match_the_uncached_node(self, cache):
+        nodeid = 'tests/test_module.py::TestClassName::test_title'
+
+        node = Node.parse(nodeid, cache.pattern_config)
+        cached = Node.parse(nodeid, cache.pattern_config, cache)
+
+        assert repr(cached) == repr(node)
+
+
 class TestResult(object):
 
     @pytest.fixture
@@ -74,3 +183,76 @@ class TestResult(object):
 
         assert from_repr.outcome == result.outcome
         assert isinstance(from_repr.node, Node)
+
+
+class TestPatternConfig(object):
+
+    def test_compile_should_compile_every_category(self):
+        pattern_config = PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        ).compile()
+
+        assert isinstance(pattern_config, PatternConfig)
+        for patterns in pattern_config:
+            assert isinstance(patterns, formatters.PatternSet)
+
+    def test_compiled_config_should_parse_the_same_node(self):
+        pattern_config = PatternConfig(
+            files=['test_*.py'],
+            functions=['test*'],
+            classes=['Test*']
+        )
+        nodeid = 'tests/test_module.py::TestClassName::test_title'
+
+        node = Node.parse(nodeid, pattern_config)
+        compiled = Node.parse(nodeid, pattern_config.compile())
+
+        assert repr(compiled) == repr(node)
+
+
+class TestMemory(object):
+
+    class DictNode(object):
+
+        def __init__(self, title, class_name, module_name):
+            self.title = title
+            self.class_name = class_name
+            self.module_name = module_name
+
+    class DictResult(object):
+
+        def __init__(self, outcome, node):
+            self.outcome = outcome
+            self.node = node
+
+    @pytest.fixture
+    def titles(self):
+        return ['does thing {}'.format(index) for index in range(100000)]
+
+    def measure(self, titles, node_class, result_class):
+        tracemalloc.start()
+        try:
+            suite = [
+                result_class('passed', node_class(
+                    title=title,
+                    class_name=''.join(['Payments ', 'API']),
+                    module_name=''.join(['payments ', 'api'])
+                ))
+                for title in titles
+            ]
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return suite, size
+
+    def test_should_use_less_memory_per_report(self, titles):
+        _, dict_size = self.measure(titles, self.DictNode, self.DictResult)
+        suite, slotted_size = self.measure(titles, Node, Result)
+
+        assert slotted_size < dict_size
+        assert not hasattr(suite[0], '__dict__')
+        assert not hasattr(suite[0].node, '__dict__')
+        assert suite[0].node.module_name is suite[-1].node.module_name
+        assert suite[0].node.class_name is suite[-1].node.class_name
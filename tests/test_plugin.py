@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import json
+import os
+import subprocess
+import sys
+
 import pytest
 from _pytest.config import ExitCode
 
+from pytest_aspec import documents, plugin, records, reporter
+
 
 class TestReport(object):
 
@@ -120,6 +127,40 @@ class TestReport(object):
         expected = ' \N{avocado} did we skip?'
         assert expected in result.stdout.str()
 
+    def test_should_decode_escapes_in_the_config(self, testdir):
+        testdir.makeini(r"""
+            [pytest]
+            pspec_passed=\N{heavy check mark}
+        """)
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+        result = testdir.runpytest('--pspec')
+
+        assert ' \N{heavy check mark} a feature is working' in (
+            result.stdout.str()
+        )
+
+    def test_custom_characters_should_not_leak_between_sessions(
+        self,
+        testdir
+    ):
+        testdir.makepyfile("""
+            def test_a_feature_is_working():
+                pass
+        """)
+        testdir.makeini("""
+            [pytest]
+            pspec_passed=[x]
+        """)
+        assert ' [x] a feature' in testdir.runpytest('--pspec').stdout.str()
+
+        testdir.tmpdir.join('tox.ini').remove()
+        result = testdir.runpytest('--pspec')
+
+        assert ' \N{cherry blossom} a feature' in result.stdout.str()
+
     def test_should_print_the_test_class_name(self, testdir):
         testdir.makepyfile("""
             class TestFoo(object):
@@ -138,6 +179,21 @@ class TestReport(object):
         lines = result.stdout.get_lines_after('Bar')
         assert '\N{cherry blossom} bar' in lines[0]
 
+    def test_should_print_every_test_below_its_header(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    pass
+        """)
+        result = testdir.runpytest('--pspec')
+
+        lines = result.stdout.get_lines_after('Foo')
+        assert '\N{cherry blossom} foo' in lines[0]
+        assert '\N{cherry blossom} bar' in lines[1]
+
     def test_should_print_the_module_name_of_a_test_without_class(
         self,
         testdir
@@ -213,6 +269,55 @@ class TestReport(object):
         expected = 'This is PySpec Class'
         assert expected in result.stdout.str()
 
+    def test_should_print_nested_classes_in_one_header(self, testdir):
+        testdir.makepyfile("""
+            class TestOuter(object):
+                "Outer spec"
+
+                class TestInner(object):
+                    def test_a_feature_is_working(self):
+                        assert True
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        result.stdout.fnmatch_lines([
+            'Outer spec Inner',
+            ' * a feature is working',
+        ])
+
+    def test_tree_should_only_print_the_headers_that_change(self, testdir):
+        testdir.makepyfile(test_tree="""
+            class TestOuter(object):
+                "Outer spec"
+
+                def test_outer(self):
+                    pass
+
+                class TestInner(object):
+                    def test_inner(self):
+                        pass
+
+                    def test_other_inner(self):
+                        pass
+
+            def test_free():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-tree')
+
+        result.stdout.fnmatch_lines([
+            'tree',
+            '  Outer spec',
+            '   * outer',
+            '    Inner',
+            '     * inner',
+            '     * other inner',
+            ' * free',
+        ])
+        assert result.stdout.str().count('Outer spec') == 1
+
     def test_should_print_class_name_if_node_length_gt_two(self, testdir):
         "This is doc"
 
@@ -264,3 +369,887 @@ class TestReport(object):
 
         assert result.ret == ExitCode.INTERNAL_ERROR
         assert "INTERNALERROR> KeyError: 'missing_key'" in result.stdout.lines
+
+    def test_should_print_cache_stats_when_verbose(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '-v')
+
+        result.stdout.fnmatch_lines([
+            '*pspec cache*',
+            'module names: 1 hits, 1 misses, 1 cached',
+            'class names: 1 hits, 1 misses, 1 cached',
+        ])
+
+    def test_should_not_print_cache_stats_by_default(self, testdir):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert 'pspec cache' not in result.stdout.str()
+
+    def test_buffered_output_should_match_the_default_output(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    assert False
+
+            class TestBar(object):
+                def test_baz(self):
+                    pass
+        """)
+
+        default = testdir.runpytest('--pspec', '--tb=short')
+        buffered = testdir.runpytest(
+            '--pspec', '--pspec-buffer=100', '--tb=short'
+        )
+
+        assert buffered.ret == default.ret
+        # the last line holds the session duration
+        assert buffered.stdout.lines[:-1] == default.stdout.lines[:-1]
+
+    @pytest.mark.parametrize('option', (
+        '--pspec-buffer=50',
+        '--pspec-async=50',
+    ))
+    def test_uncaptured_output_should_follow_earlier_specs(
+        self, testdir, option
+    ):
+        testdir.makepyfile("""
+            def test_first():
+                pass
+
+            def test_second():
+                print('PRINTED')
+        """)
+
+        result = testdir.runpytest('--pspec', option, '-s')
+
+        result.stdout.fnmatch_lines([
+            ' * first',
+            '*PRINTED*',
+            ' * second',
+        ])
+
+    def test_async_output_should_match_the_default_output(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+                def test_bar(self):
+                    assert False
+        """)
+
+        default = testdir.runpytest('--pspec', '--tb=short')
+        threaded = testdir.runpytest(
+            '--pspec', '--pspec-async=2', '--pspec-buffer=10', '--tb=short'
+        )
+
+        assert threaded.ret == default.ret
+        # the last line holds the session duration
+        assert threaded.stdout.lines[:-1] == default.stdout.lines[:-1]
+
+    def test_async_output_should_be_written_on_interrupt(
+        self, testdir, monkeypatch
+    ):
+        monkeypatch.setenv('PYTHONPATH', os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        ))
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+
+            def test_interrupted():
+                raise KeyboardInterrupt
+        """)
+
+        result = testdir.runpytest_subprocess('--pspec', '--pspec-async=1')
+
+        result.stdout.fnmatch_lines([
+            ' * foo',
+            '*KeyboardInterrupt*',
+        ])
+
+    def test_report_should_list_specs_in_collection_order(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_aspec.plugin'
+
+            def pytest_collection_modifyitems(items):
+                items.reverse()
+        """)
+        testdir.makepyfile(test_report="""
+            import pytest
+
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_first(self):
+                    pass
+
+                @pytest.mark.parametrize('value', [2, 10])
+                def test_second(self, value):
+                    "second {value}"
+                    assert value == 2
+
+            def test_free():
+                pass
+
+            class TestBar(object):
+                def test_bar(self):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-report=report.txt')
+
+        assert result.ret == ExitCode.TESTS_FAILED
+        assert testdir.tmpdir.join('report.txt').read_text('utf-8') == (
+            '\nreport\n======\n'
+            '\nFoo spec\n'
+            ' \N{cherry blossom} first\n'
+            ' \N{cherry blossom} second 2\n'
+            ' \N{wilted flower} second 10\n'
+            '\nreport\n'
+            ' \N{cherry blossom} free\n'
+            '\nBar\n'
+            ' \N{cherry blossom} bar\n'
+            '\n4 passed, 1 failed\n'
+        )
+
+    def test_lazy_nodeids_should_print_the_same_specs(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_foo(self):
+                    "it works"
+
+                @pytest.mark.parametrize('value', [1, 2])
+                def test_bar(self, value):
+                    "it takes {value}"
+                    assert value == 1
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-lazy-nodeids')
+
+        result.stdout.fnmatch_lines([
+            'Foo spec',
+            ' \N{cherry blossom} it works',
+            ' \N{cherry blossom} it takes 1',
+            ' \N{wilted flower} it takes 2',
+        ])
+
+    @pytest.mark.parametrize('options', ([], ['--pspec-lazy-nodeids']))
+    def test_should_keep_nodeids_of_other_items(self, testdir, options):
+        testdir.makeconftest("""
+            import pytest
+
+            pytest_plugins = 'pytest_aspec.plugin'
+
+            class SpecItem(pytest.Item):
+                def runtest(self):
+                    pass
+
+            class SpecFile(pytest.File):
+                def collect(self):
+                    yield SpecItem.from_parent(self, name='reads specs')
+
+            def pytest_collect_file(parent, file_path):
+                if file_path.suffix == '.spec':
+                    return SpecFile.from_parent(parent, path=file_path)
+        """)
+        testdir.makefile('.spec', things='')
+
+        result = testdir.runpytest('--pspec', *options)
+
+        assert result.ret == ExitCode.OK
+        result.stdout.fnmatch_lines([' \N{cherry blossom} reads specs'])
+
+    def test_lazy_nodeids_should_keep_the_real_nodeids(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_foo(self):
+                    assert False
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-lazy-nodeids', '-rf')
+
+        result.stdout.fnmatch_lines(['FAILED *::TestFoo::test_foo*'])
+
+    def test_lazy_nodeids_should_skip_deselected_tests(self, testdir):
+        testdir.makepyfile("""
+            import pytest
+
+            def test_kept():
+                pass
+
+            @pytest.mark.parametrize('value', [1])
+            def test_dropped(value):
+                "{missing_key}"
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-lazy-nodeids', '-k', 'kept'
+        )
+
+        assert result.ret == ExitCode.OK
+        assert ' \N{cherry blossom} kept' in result.stdout.str()
+
+    def test_should_group_interleaved_headers_under_xdist(self, testdir):
+        testdir.makeconftest("""
+            def pytest_addoption(parser):
+                # stands in for the option of pytest-xdist, which is kept
+                # out of the run when it is installed
+                parser.addoption('--dist', default='no')
+
+            def pytest_collection_modifyitems(items):
+                foo = [item for item in items if 'TestFoo' in item.nodeid]
+                bar = [item for item in items if 'TestBar' in item.nodeid]
+                items[:] = [
+                    item for pair in zip(foo, bar) for item in pair
+                ]
+        """)
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_one(self):
+                    pass
+
+                def test_two(self):
+                    pass
+
+            class TestBar(object):
+                def test_three(self):
+                    pass
+
+                def test_four(self):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '-p', 'no:xdist', '-p', 'pytest_aspec.plugin', '--pspec',
+            '--dist=load'
+        )
+
+        assert result.stdout.lines.count('Foo') == 1
+        assert result.stdout.lines.count('Bar') == 1
+        result.stdout.fnmatch_lines([
+            'Foo',
+            ' \N{cherry blossom} one',
+            ' \N{cherry blossom} two',
+            '*',
+            'Bar',
+            ' \N{cherry blossom} three',
+            ' \N{cherry blossom} four',
+        ])
+
+    def test_should_group_headers_of_xdist_workers(
+        self, testdir, monkeypatch
+    ):
+        pytest.importorskip('xdist')
+        monkeypatch.setenv('PYTHONPATH', os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        ))
+        testdir.makepyfile(**{
+            'test_{}'.format(name): """
+                class TestOuter(object):
+                    "Outer things"
+
+                    def test_one(self):
+                        pass
+
+                    def test_two(self):
+                        pass
+
+                def test_a():
+                    pass
+            """
+            for name in ('first', 'second')
+        })
+
+        result = testdir.runpytest_subprocess(
+            '-p', 'pytest_aspec.plugin', '--pspec', '-n', '2'
+        )
+
+        assert result.stdout.lines.count('Outer things') == 2
+
+    @pytest.mark.parametrize('options', ([], ['--pspec-lazy-nodeids']))
+    def test_should_stream_results_as_json_lines(self, testdir, options):
+        testdir.makepyfile(test_module="""
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_foo(self):
+                    "it works"
+
+                def test_bar(self):
+                    assert False
+        """)
+
+        testdir.runpytest('--pspec', '--pspec-jsonl=pspec.jsonl', *options)
+
+        with testdir.tmpdir.join('pspec.jsonl').open(encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert [
+            (record['header'], record['title'], record['outcome'],
+             record['nodeid'])
+            for record in records
+        ] == [
+            ('Foo spec', 'it works', 'passed',
+             'test_module.py::TestFoo::test_foo'),
+            ('Foo spec', 'bar', 'failed', 'test_module.py::TestFoo::test_bar'),
+        ]
+        assert all(record['duration'] >= 0 for record in records)
+
+    @pytest.mark.parametrize('options', ([], ['-rA']))
+    def test_lean_stats_should_keep_the_summary(self, testdir, options):
+        testdir.makepyfile("""
+            import pytest
+
+            def test_passing():
+                pass
+
+            def test_passing_too():
+                pass
+
+            def test_failing():
+                print('captured')
+                assert 1 == 2
+
+            @pytest.mark.skip(reason='not today')
+            def test_skipped():
+                pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-lean-stats', '-rfs', *options
+        )
+
+        assert result.ret == ExitCode.TESTS_FAILED
+        result.stdout.fnmatch_lines([
+            '*FAILURES*',
+            '*assert 1 == 2*',
+            '*Captured stdout call*',
+            'captured',
+            '*short test summary info*',
+            'FAILED *failing - assert 1*',
+            '*1 failed, 2 passed, 1 skipped*',
+        ])
+        result.stdout.fnmatch_lines(['SKIPPED *not today'])
+
+    def test_should_report_durations_per_spec_and_header(self, testdir):
+        testdir.makepyfile("""
+            import time
+
+            class TestFast(object):
+                def test_foo(self):
+                    pass
+
+            class TestSlow(object):
+                def test_bar(self):
+                    time.sleep(0.05)
+
+                def test_baz(self):
+                    time.sleep(0.05)
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-durations=1')
+
+        result.stdout.fnmatch_lines([
+            'Fast',
+            ' * foo (0.*s)',
+            '   1 specs in 0.*s',
+            'Slow',
+            ' * bar (0.*s)',
+            ' * baz (0.*s)',
+            '   2 specs in 0.1*s',
+            '*slowest 1 pspec headers*',
+            '0.1*s 2 specs  Slow',
+            '*3 passed*',
+        ])
+        assert ' 1 specs  Fast' not in result.stdout.str()
+
+    def test_durations_should_list_every_header_with_zero(self, testdir):
+        testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    pass
+
+            class TestBar(object):
+                def test_bar(self):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-durations=0')
+
+        result.stdout.fnmatch_lines(['*slowest 2 pspec headers*'])
+
+    def test_durations_should_leave_file_arguments_alone(self, testdir):
+        test_file = testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-durations', '3', str(test_file)
+        )
+
+        result.stdout.fnmatch_lines([' * foo (0.*s)', '*1 passed*'])
+
+    def test_should_not_report_durations_by_default(self, testdir):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert 'specs in' not in result.stdout.str()
+        assert 'slowest' not in result.stdout.str()
+
+    def test_should_report_its_own_overhead(self, testdir):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+        profile = testdir.tmpdir.join('profile.json')
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-profile',
+            '--pspec-profile-file={}'.format(profile)
+        )
+
+        result.stdout.fnmatch_lines([
+            '*pspec profile*',
+            'pytest_collection_modifyitems: 1 calls, *ms total, p50 *us*',
+            'pytest_runtest_logreport: 3 calls, *',
+            'Node.parse: 1 calls, *',
+            'renderer: 1 calls, *',
+            'terminal writes: 1 calls, *',
+        ])
+        names = [timing['name'] for timing in json.loads(profile.read())]
+        assert 'Node.parse' in names
+
+    def test_should_not_profile_by_default(self, testdir):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        assert 'pspec profile' not in result.stdout.str()
+
+    def test_should_let_plugins_add_rendering_stages(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_aspec.plugin'
+
+            def pytest_pspec_add_stages(config, pipeline):
+                pipeline.add_stage(
+                    lambda result, line: '{} <{}>'.format(line, result.outcome)
+                )
+        """)
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-durations=1')
+
+        result.stdout.fnmatch_lines([' * foo (0.*s) <passed>'])
+
+    def test_should_reuse_stored_names_of_unchanged_modules(self, testdir):
+        test_file = testdir.makepyfile("""
+            class TestFoo(object):
+                def test_foo(self):
+                    "it is computed"
+        """)
+        testdir.runpytest('--pspec', '--pspec-store-names')
+        cache_file = testdir.tmpdir.join(
+            '.pytest_cache', 'v', 'pspec', 'names'
+        )
+        cache_file.write(cache_file.read().replace('it is computed', 'stored'))
+
+        result = testdir.runpytest('--pspec', '--pspec-store-names')
+        result.stdout.fnmatch_lines([' * stored'])
+
+        stat = test_file.stat()
+        test_file.setmtime(stat.mtime + 10)
+        result = testdir.runpytest('--pspec', '--pspec-store-names')
+        result.stdout.fnmatch_lines([' * it is computed'])
+
+    def test_progress_should_turn_itself_off_without_a_terminal(
+        self,
+        testdir
+    ):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-progress')
+
+        result.stdout.fnmatch_lines([' * foo', '*1 passed*'])
+        assert '\x1b[K' not in result.stdout.str()
+        assert 'tests/s' not in result.stdout.str()
+
+    def test_progress_should_be_shown_while_a_test_runs(self, testdir):
+        testdir.makeconftest("""
+            import pytest
+
+            from pytest_aspec.progress import ProgressFooter
+
+            pytest_plugins = 'pytest_aspec.plugin'
+
+            class Terminal(object):
+                fullwidth = 80
+
+                def write(self, text):
+                    pass
+
+                def flush(self):
+                    pass
+
+            def pytest_sessionstart(session):
+                reporter = session.config.pluginmanager.getplugin(
+                    'terminalreporter'
+                )
+                # stands in for a terminal, with a text that is never due
+                # again once drawn
+                reporter.progress = ProgressFooter(Terminal(), interval=3600)
+
+            @pytest.fixture
+            def footer(request):
+                return request.config.pluginmanager.getplugin(
+                    'terminalreporter'
+                ).progress
+        """)
+        testdir.makepyfile("""
+            def test_fast(footer):
+                assert footer.visible
+
+            def test_slow(footer):
+                assert footer.visible
+        """)
+
+        result = testdir.runpytest('--pspec')
+
+        result.stdout.fnmatch_lines(['*2 passed*'])
+
+    def test_collapse_should_only_print_summaries_and_failures(
+        self,
+        testdir
+    ):
+        testdir.makepyfile("""
+            import pytest
+
+            class TestPayments(object):
+                "Payments API"
+
+                @pytest.mark.parametrize('value', range(5))
+                def test_charges(self, value):
+                    pass
+
+                def test_refunds(self):
+                    assert False
+
+                @pytest.mark.skip
+                def test_disputes(self):
+                    pass
+
+            class TestInvoices(object):
+                def test_sends(self):
+                    pass
+        """)
+
+        result = testdir.runpytest('--pspec', '--pspec-collapse')
+
+        result.stdout.fnmatch_lines([
+            'Payments API  5 passed, 1 failed, 1 skipped',
+            ' * refunds',
+            'Invoices  1 passed',
+            '*1 failed, 6 passed, 1 skipped*',
+        ])
+        output = result.stdout.str()
+        assert 'charges' not in output
+        assert 'disputes' not in output
+        assert ' sends' not in output
+
+    def test_collapse_should_add_block_durations(self, testdir):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-collapse', '--pspec-durations=1'
+        )
+
+        result.stdout.fnmatch_lines(['* 1 passed in 0.*s'])
+        assert '1 specs in' not in result.stdout.str()
+
+    def test_shards_of_several_runs_should_merge(self, testdir):
+        testdir.makepyfile(test_first="""
+            class TestFoo(object):
+                "Foo spec"
+
+                def test_one(self):
+                    pass
+
+                def test_two(self):
+                    pass
+        """, test_second="""
+            def test_three():
+                pass
+        """)
+        testdir.runpytest('--pspec', '--pspec-shard=one.jsonl', '-k', 'two')
+        testdir.runpytest(
+            '--pspec', '--pspec-shard=two.jsonl', '-k', 'not two'
+        )
+        report = testdir.tmpdir.join('report.txt')
+
+        status = records.main([
+            'merge', '-o', str(report),
+            str(testdir.tmpdir.join('one.jsonl')),
+            str(testdir.tmpdir.join('two.jsonl')),
+        ])
+
+        assert status == 0
+        assert report.read_text('utf-8').splitlines() == [
+            '',
+            'Foo spec',
+            ' \N{cherry blossom} one',
+            ' \N{cherry blossom} two',
+            '',
+            'second',
+            ' \N{cherry blossom} three',
+            '',
+            '3 passed',
+        ]
+
+    @pytest.mark.parametrize('options', [(), ('--pspec-lazy-nodeids',)])
+    def test_should_fold_parametrized_variants(self, testdir, options):
+        testdir.makepyfile("""
+            import pytest
+
+            class TestAmounts(object):
+                "Amounts"
+
+                @pytest.mark.parametrize('value', range(50))
+                def test_accepts(self, value):
+                    "accepts {value}"
+                    assert value != 7
+
+                @pytest.mark.parametrize('value', range(3))
+                def test_rounds(self, value):
+                    pass
+
+                def test_sums(self):
+                    pass
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-group-params', *options
+        )
+
+        result.stdout.fnmatch_lines([
+            'Amounts',
+            ' \N{wilted flower} accepts {value} (49 passed, 1 failed)',
+            ' \N{wilted flower}   accepts 7',
+            ' \N{cherry blossom} rounds (3 passed)',
+            ' \N{cherry blossom} sums',
+            '*test_accepts[[]7[]]*',
+            '*1 failed, 53 passed*',
+        ])
+        assert 'accepts 8' not in result.stdout.str()
+
+    @pytest.mark.parametrize('options', [(), ('--pspec-collapse',)])
+    def test_should_fold_interleaved_variants(self, testdir, options):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_aspec.plugin'
+
+            def pytest_collection_modifyitems(items):
+                # runs the variants of both functions in turn
+                items.sort(key=lambda item: item.callspec.id)
+        """)
+        testdir.makepyfile("""
+            import pytest
+
+            class TestAmounts(object):
+                "Amounts"
+
+                @pytest.mark.parametrize('value', [1, 2])
+                def test_accepts(self, value):
+                    pass
+
+                @pytest.mark.parametrize('value', [1, 2])
+                def test_rounds(self, value):
+                    assert value == 1
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-group-params', *options
+        )
+
+        result.stdout.fnmatch_lines(['*1 failed, 3 passed*'])
+        output = result.stdout.str()
+        if options:
+            assert ' \N{wilted flower} rounds (1 passed, 1 failed)' in output
+        else:
+            assert output.count('accepts (2 passed)') == 1
+            assert output.count('rounds (1 passed, 1 failed)') == 1
+
+    def test_sinks_should_name_each_grouped_variant(self, testdir):
+        testdir.makepyfile(test_module="""
+            import pytest
+
+            @pytest.mark.parametrize('v', [1, 2])
+            def test_checks(v):
+                "checks {v}"
+        """)
+
+        result = testdir.runpytest(
+            '--pspec', '--pspec-group-params', '--pspec-jsonl=pspec.jsonl',
+            '--pspec-report=report.txt'
+        )
+
+        result.stdout.fnmatch_lines([
+            ' \N{cherry blossom} checks {v} (2 passed)'
+        ])
+        with testdir.tmpdir.join('pspec.jsonl').open(encoding='utf-8') as f:
+            titles = [json.loads(line)['title'] for line in f]
+        assert titles == ['checks 1', 'checks 2']
+        report = testdir.tmpdir.join('report.txt').read_text('utf-8')
+        assert ' \N{cherry blossom} checks 1\n' in report
+        assert ' \N{cherry blossom} checks 2\n' in report
+        assert '{v}' not in report
+
+    @pytest.mark.parametrize('options', [(), ('-n', '2')])
+    def test_should_fold_variants_with_separators_in_their_ids(
+        self,
+        testdir,
+        monkeypatch,
+        options
+    ):
+        if options:
+            pytest.importorskip('xdist')
+        monkeypatch.setenv('PYTHONPATH', os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        ))
+        testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.parametrize('v', ['a::b', 'c'])
+            def test_x(v):
+                pass
+
+            def test_y():
+                pass
+        """)
+
+        result = testdir.runpytest_subprocess(
+            '-p', 'pytest_aspec.plugin', '--pspec', '--pspec-group-params',
+            *options
+        )
+
+        assert result.stdout.str().count(' x (2 passed)') == 1
+        assert ' x (1 passed)' not in result.stdout.str()
+
+
+class TestDisabledPlugin(object):
+
+    #: The most the import of the plugin may take once pytest is imported.
+    max_import_us = 50000
+
+    @pytest.fixture
+    def env(self):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        )
+        return env
+
+    def import_times(self, env):
+        output = subprocess.check_output(
+            [
+                sys.executable, '-X', 'importtime', '-c',
+                'import pytest, _pytest.terminal; import pytest_aspec.plugin'
+            ],
+            env=env,
+            stderr=subprocess.STDOUT
+        ).decode('utf-8')
+        times = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line.split('|')
+            times[name.strip()] = int(cumulative)
+        return times
+
+    def test_import_should_only_load_the_entry_point(self, env):
+        times = self.import_times(env)
+
+        assert sorted(
+            name for name in times if name.startswith('pytest_aspec')
+        ) == ['pytest_aspec', 'pytest_aspec.hookspecs', 'pytest_aspec.plugin']
+        assert 'six' not in times
+        assert times['pytest_aspec.plugin'] < self.max_import_us
+
+    def test_session_should_not_load_the_reporter(self, testdir, env):
+        testdir.makepyfile("""
+            def test_foo():
+                pass
+        """)
+
+        output = subprocess.check_output(
+            [
+                sys.executable, '-c',
+                'import sys, pytest; '
+                'pytest.main(["-p", "pytest_aspec.plugin", "-q"]); '
+                'print(sorted(name for name in sys.modules '
+                'if name.startswith("pytest_aspec")))'
+            ],
+            cwd=str(testdir.tmpdir),
+            env=env
+        ).decode('utf-8')
+
+        assert output.splitlines()[-1] == (
+            "['pytest_aspec', 'pytest_aspec.hookspecs', 'pytest_aspec.plugin']"
+        )
+
+    def test_hooks_should_only_be_registered_with_pspec(self, testdir):
+        testdir.makeconftest("""
+            pytest_plugins = 'pytest_aspec.plugin'
+        """)
+
+        disabled = testdir.parseconfigure()
+        assert disabled.pluginmanager.getplugin('pspec-hooks') is None
+
+        enabled = testdir.parseconfigure('--pspec')
+        assert enabled.pluginmanager.getplugin('pspec-hooks') is not None
+        assert isinstance(
+            enabled.pluginmanager.getplugin('terminalreporter'),
+            reporter.PspecTerminalReporter
+        )
+
+    def test_reporter_should_still_be_importable_from_the_plugin(self):
+        assert plugin.PspecTerminalReporter is reporter.PspecTerminalReporter
+
+    def test_report_formats_should_match_the_documents(self):
+        assert sorted(plugin.REPORT_FORMATS) == sorted(documents.DOCUMENTS)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+
+from pytest_aspec.profiling import Profiler
+
+
+class FakeClock(object):
+
+    def __init__(self, steps):
+        self.now = 0.0
+        self.steps = iter(steps)
+
+    def __call__(self):
+        self.now += next(self.steps)
+        return self.now
+
+
+class Thing(object):
+
+    def method(self, value):
+        return value * 2
+
+    @classmethod
+    def build(cls, value):
+        return cls, value
+
+
+class TestProfiler(object):
+
+    def test_should_time_every_call(self):
+        profiler = Profiler(clock=FakeClock([0, 1, 0, 3, 0, 2]))
+        thing = Thing()
+        profiler.wrap_method('method', thing, 'method')
+
+        assert [thing.method(value) for value in (1, 2, 3)] == [2, 4, 6]
+        assert profiler.summary() == [('method', 3, 6.0, 2.0, 3.0)]
+
+    def test_should_time_failing_calls(self):
+        profiler = Profiler(clock=FakeClock([0, 1]))
+        timed = profiler.wrap('fails', lambda: 1 / 0)
+
+        try:
+            timed()
+        except ZeroDivisionError:
+            pass
+
+        assert profiler.summary() == [('fails', 1, 1.0, 1.0, 1.0)]
+
+    def test_should_patch_and_restore_class_methods(self):
+        profiler = Profiler()
+        original = Thing.__dict__['build']
+
+        restore = profiler.patch('build', Thing, 'build')
+        assert Thing.build(1) == (Thing, 1)
+        restore()
+
+        assert Thing.__dict__['build'] is original
+        assert profiler.summary()[0][:2] == ('build', 1)
+
+    def test_should_report_timers_without_calls(self):
+        profiler = Profiler()
+        profiler.wrap('unused', lambda: None)
+
+        assert profiler.summary() == [('unused', 0, 0.0, 0.0, 0.0)]
+
+    def test_should_write_json(self, tmpdir):
+        profiler = Profiler(clock=FakeClock([0, 1]))
+        profiler.wrap('call', lambda: None)()
+        path = tmpdir.join('profile.json')
+
+        profiler.write(str(path))
+
+        assert json.loads(path.read()) == [
+            {'name': 'call', 'calls': 1, 'total': 1.0, 'p50': 1.0, 'p99': 1.0}
+        ]
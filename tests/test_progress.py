@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_aspec.progress import CLEAR_LINE, ProgressFooter
+
+
+class FakeTerminalWriter(object):
+    fullwidth = 80
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, text):
+        self.written.append(text)
+
+    def flush(self):
+        pass
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def tw():
+    return FakeTerminalWriter()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def footer(tw, clock):
+    footer = ProgressFooter(tw, interval=1.0, clock=clock)
+    footer.start(100)
+    return footer
+
+
+class TestProgressFooter(object):
+
+    def test_should_show_progress_rate_eta_and_header(
+        self,
+        footer,
+        tw,
+        clock
+    ):
+        clock.now += 10
+
+        footer.update(20, 'Payments API')
+
+        assert tw.written == [
+            CLEAR_LINE + '[20/100] 2.0 tests/s ETA 0:00:40 Payments API'
+        ]
+
+    def test_should_not_redraw_more_often_than_the_interval(
+        self,
+        footer,
+        tw,
+        clock
+    ):
+        clock.now += 1
+        footer.update(1)
+        footer.update(2)
+        clock.now += 0.5
+        footer.update(3)
+        clock.now += 0.5
+        footer.update(4)
+
+        assert tw.written == [
+            CLEAR_LINE + '[1/100] 1.0 tests/s ETA 0:01:39',
+            CLEAR_LINE + '[4/100] 2.0 tests/s ETA 0:00:48',
+        ]
+
+    def test_show_should_redraw_the_last_text_once_cleared(
+        self,
+        footer,
+        tw,
+        clock
+    ):
+        clock.now += 1
+        footer.update(1)
+        footer.clear()
+        footer.update(2)
+        footer.show()
+        footer.show()
+
+        assert tw.written == [
+            CLEAR_LINE + '[1/100] 1.0 tests/s ETA 0:01:39',
+            CLEAR_LINE,
+            CLEAR_LINE + '[1/100] 1.0 tests/s ETA 0:01:39',
+        ]
+
+    def test_should_only_clear_when_visible(self, footer, tw):
+        footer.clear()
+
+        assert tw.written == []
+
+    def test_should_fit_the_terminal_width(self, footer, tw, clock):
+        tw.fullwidth = 10
+        clock.now += 1
+
+        footer.update(1, 'A very long header')
+
+        assert tw.written == [CLEAR_LINE + '[1/100] 1']
+
+    def test_should_leave_out_the_total_when_unknown(self, tw, clock):
+        footer = ProgressFooter(tw, clock=clock)
+
+        footer.update(3)
+
+        assert tw.written == [CLEAR_LINE + '[3] 0.0 tests/s']
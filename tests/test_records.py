@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+from pytest_aspec import records
+from pytest_aspec.models import Node, Result
+from pytest_aspec.records import Record
+
+
+def record(path, class_name, line, title, outcome='passed'):
+    return Record(
+        path=path,
+        class_name=class_name,
+        line=line,
+        nodeid='{}::{}::{}'.format(path, class_name, title),
+        module_name=path[:-3],
+        title=title,
+        outcome=outcome,
+        duration=0.1,
+    )
+
+
+@pytest.fixture
+def shards(tmpdir):
+    first = str(tmpdir.join('first.jsonl'))
+    second = str(tmpdir.join('second.jsonl'))
+    records.write_records(first, [
+        record('a.py', 'Bar', 1, 'one'),
+        record('b.py', '', 1, 'three', 'failed'),
+    ])
+    records.write_records(second, [
+        record('a.py', 'Bar', 2, 'two'),
+        record('a.py', 'Foo', 9, 'four', 'skipped'),
+    ])
+    return [first, second]
+
+
+class TestRecord(object):
+
+    def test_should_be_created_from_a_result(self):
+        result = Result(
+            'passed',
+            Node('works', '', 'module'),
+            duration=0.5,
+            nodeid='tests/test_module.py::test_works',
+            location=('tests/test_module.py', None, 'test_works')
+        )
+
+        created = Record.from_result(result)
+
+        assert created.path == 'tests/test_module.py'
+        assert created.line == -1
+        assert created.header == 'module'
+
+    def test_should_read_shards_without_an_index(self, tmpdir):
+        shard = tmpdir.join('shard.jsonl')
+        shard.write('["a.py", "Bar", 1, "a.py::Bar::one", "a", "one", '
+                    '"passed", 0.1]\n')
+
+        read = list(records.read_records(str(shard)))
+
+        assert read == [record('a.py', 'Bar', 1, 'one')]
+        assert read[0].index is None
+
+    def test_should_round_trip_through_a_file(self, tmpdir):
+        path = str(tmpdir.join('shard.jsonl'))
+        written = [record('a.py', 'Bar', 1, '\N{snowman}')]
+
+        records.write_records(path, written)
+
+        assert list(records.read_records(path)) == written
+
+
+class TestMerge(object):
+
+    def test_should_merge_shards_in_order(self, shards):
+        assert [r.title for r in records.merge(shards)] == [
+            'one', 'two', 'four', 'three'
+        ]
+
+    def test_should_write_a_grouped_report(self, shards):
+        out = io.StringIO()
+
+        counts = records.write_report(
+            records.merge(shards),
+            out,
+            {'passed': '+', 'failed': 'x', 'default': '?'}
+        )
+
+        assert out.getvalue() == (
+            '\nBar\n + one\n + two\n'
+            '\nFoo\n ? four\n'
+            '\nb\n x three\n'
+            '\n2 passed, 1 failed, 1 skipped\n'
+        )
+        assert counts['failed'] == 1
+
+    def test_main_should_fail_when_a_spec_failed(self, shards, tmpdir):
+        output = tmpdir.join('report.txt')
+
+        assert records.main(['merge', '-o', str(output)] + shards) == 1
+        assert 'Bar' in output.read_text('utf-8')
+
+    def test_main_should_pass_without_failures(self, shards, capsys):
+        assert records.main(['merge', shards[1]]) == 0
+        assert '\N{cherry blossom} two' in capsys.readouterr().out
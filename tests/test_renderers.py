@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_aspec import models, renderers
+
+
+@pytest.fixture
+def result():
+    return models.Result(
+        'failed',
+        models.Node('does a thing', 'A Thing', 'module'),
+        duration=0.125
+    )
+
+
+@pytest.fixture
+def render():
+    return renderers.outcome_renderer({'passed': 'P', 'failed': 'F'}, '?')
+
+
+class TestOutcomeRenderer(object):
+
+    def test_should_prefix_the_title_with_the_outcome(self, result, render):
+        assert render(result) == ' F does a thing'
+
+    def test_should_use_the_default_for_other_outcomes(self, result, render):
+        result.outcome = 'xfailed'
+
+        assert render(result) == ' ? does a thing'
+
+
+class TestPipeline(object):
+
+    def test_should_only_render_without_stages(self, render):
+        assert renderers.Pipeline(render).compose() is render
+
+    def test_should_apply_stages_in_order(self, result, render):
+        pipeline = renderers.Pipeline(render)
+        pipeline.add_stage(renderers.duration_stage)
+        pipeline.add_stage(lambda result, line: line + '!')
+
+        assert pipeline.compose()(result) == ' F does a thing (0.12s)!'
+
+    def test_should_not_see_stages_added_after_compose(self, result, render):
+        pipeline = renderers.Pipeline(render)
+        composed = pipeline.compose()
+        pipeline.add_stage(lambda result, line: line + '!')
+
+        assert composed(result) == ' F does a thing'
+
+
+class TestDecodeSymbol(object):
+
+    @pytest.mark.parametrize('value,expected', (
+        (r'\N{snowman}\N{vs16}', '\N{snowman}\N{vs16}'),
+        (r'\u2603', '\N{snowman}'),
+        ('\N{snowman} [x]', '\N{snowman} [x]'),
+        ('caf\xe9', 'caf\xe9'),
+        (r'\N{no such character}', r'\N{no such character}'),
+    ))
+    def test_should_decode_escapes(self, value, expected):
+        assert renderers.decode_symbol(value) == expected
+
+    def test_should_not_evaluate_python(self):
+        value = "' + str(1 + 1) + '"
+
+        assert renderers.decode_symbol(value) == value
+
+
+class TestOutcomeCharacters(object):
+
+    def test_should_fall_back_to_the_defaults(self):
+        characters = renderers.outcome_characters({'passed': r'\u2603'})
+
+        assert characters['passed'] == '\N{snowman}'
+        assert characters['failed'] == '\N{wilted flower}'
+
+    def test_should_escape_what_the_terminal_cannot_encode(self):
+        characters = renderers.outcome_characters(
+            {'passed': '\N{snowman}', 'failed': '[x]'},
+            encoding='ascii'
+        )
+
+        assert characters['passed'] == r'\u2603'
+        assert characters['failed'] == '[x]'
+
+    def test_should_ignore_unknown_encodings(self):
+        characters = renderers.outcome_characters(
+            {'passed': '\N{snowman}'},
+            encoding='no-such-encoding'
+        )
+
+        assert characters['passed'] == '\N{snowman}'
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import json
+
+import pytest
+
+from pytest_aspec.models import Node, Result
+from pytest_aspec.records import read_records
+from pytest_aspec.sinks import JsonLinesSink, ReportSink, ShardSink
+
+
+@pytest.fixture
+def result():
+    node = Node(title='works', class_name='Foo', module_name='module')
+    return Result('passed', node, duration=0.5, nodeid='test_module.py::test')
+
+
+class TestJsonLinesSink(object):
+
+    @pytest.fixture
+    def path(self, tmpdir):
+        return str(tmpdir.join('pspec.jsonl'))
+
+    def read(self, path):
+        with io.open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_should_write_a_record_per_result(self, path, result):
+        sink = JsonLinesSink(path)
+        sink.write(result)
+        sink.write(result)
+        sink.close()
+
+        assert self.read(path) == [{
+            'header': 'Foo',
+            'title': 'works',
+            'outcome': 'passed',
+            'duration': 0.5,
+            'nodeid': 'test_module.py::test',
+        }] * 2
+
+    def test_should_flush_once_the_interval_elapsed(self, path, result):
+        now = [0.0]
+        sink = JsonLinesSink(path, flush_interval=1.0, clock=lambda: now[0])
+
+        sink.write(result)
+        assert self.read(path) == []
+
+        now[0] = 1.0
+        sink.write(result)
+        assert len(self.read(path)) == 2
+        sink.close()
+
+
+class TestShardSink(object):
+
+    def results(self, count):
+        return [
+            Result(
+                'passed',
+                Node('spec {}'.format(index), 'Foo', 'module'),
+                duration=0.1,
+                nodeid='test_module.py::TestFoo::test_{:03d}'.format(index),
+                location=('test_module.py', index, 'TestFoo.test'),
+                index=index
+            )
+            for index in reversed(range(count))
+        ]
+
+    @pytest.mark.parametrize('chunk_size', [1000, 3])
+    def test_should_write_sorted_records(self, tmpdir, chunk_size):
+        path = str(tmpdir.join('shard.jsonl'))
+        sink = ShardSink(path, chunk_size=chunk_size)
+        for result in self.results(10):
+            sink.write(result)
+        sink.close()
+
+        records = list(read_records(path))
+        assert [record.line for record in records] == list(range(10))
+        assert tmpdir.listdir() == [tmpdir.join('shard.jsonl')]
+
+
+class TestReportSink(object):
+
+    def test_should_write_a_document_in_definition_order(self, tmpdir):
+        path = str(tmpdir.join('report.md'))
+        sink = ReportSink(path, chunk_size=3)
+        for result in TestShardSink().results(10):
+            sink.write(result)
+        sink.close()
+
+        with io.open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        specs = [line for line in lines if line.startswith('- ')]
+        assert specs == [
+            '- \N{cherry blossom} spec {}'.format(index) for index in range(10)
+        ]
+        assert tmpdir.listdir() == [tmpdir.join('report.md')]
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pytest
+
+from pytest_aspec import stats
+
+
+class FakeReport(object):
+
+    def __init__(self, longrepr, sections=()):
+        self.longrepr = longrepr
+        self.sections = list(sections)
+
+
+class FakeLongRepr(object):
+
+    reprcrash = 'crash'
+
+    def __str__(self):
+        return 'E' * (stats.LONGREPR_LIMIT + 10)
+
+
+class TestCountedReports(object):
+
+    def test_should_only_count_reports(self):
+        reports = stats.CountedReports()
+        reports.append(object())
+        reports.extend([object(), object()])
+
+        assert len(reports) == 3
+        assert reports
+        assert list(reports) == [stats.COUNTED_REPORT] * 3
+
+    def test_should_be_falsy_when_empty(self):
+        assert not stats.CountedReports()
+
+
+class TestCompactReport(object):
+
+    @pytest.fixture
+    def report(self):
+        return FakeReport(
+            FakeLongRepr(),
+            [('Captured stdout call', 'O' * (stats.LONGREPR_LIMIT + 5))]
+        )
+
+    def test_should_truncate_the_longrepr(self, report):
+        compact = stats.compact_report(report)
+
+        text = str(compact.longrepr)
+        assert text.startswith('E' * stats.LONGREPR_LIMIT + '\n')
+        assert text.endswith('(10 characters truncated)')
+        assert compact.longrepr.reprcrash == 'crash'
+        assert isinstance(report.longrepr, FakeLongRepr)
+
+    def test_should_truncate_captured_output(self, report):
+        compact = stats.compact_report(report)
+
+        name, content = compact.sections[0]
+        assert name == 'Captured stdout call'
+        assert content.endswith('(5 characters truncated)')
+
+    def test_should_drop_captured_output_when_asked(self, report):
+        assert stats.compact_report(report, keep_sections=False).sections == []
+
+    def test_should_keep_skip_locations(self):
+        report = FakeReport(('test_module.py', 1, 'Skipped: reason'))
+
+        assert stats.compact_report(report).longrepr == report.longrepr
+
+
+class TestHeaderDurations(object):
+
+    def test_should_sum_durations_per_header(self):
+        durations = stats.HeaderDurations()
+        durations.add('A', 0.5)
+        durations.add('B', 0.25)
+        durations.add('A', 1.0)
+        durations.add('C', None)
+
+        assert len(durations) == 3
+        assert durations.slowest(2) == [('A', 1.5, 2), ('B', 0.25, 1)]
+        assert durations.slowest(10)[-1] == ('C', 0.0, 1)
+
+
+class TestFormatOutcomes(object):
+
+    def test_should_list_known_outcomes_first(self):
+        counts = {'xfailed': 1, 'skipped': 2, 'passed': 3, 'error': 1}
+
+        assert stats.format_outcomes(counts) == (
+            '3 passed, 2 skipped, 1 error, 1 xfailed'
+        )
+
+    def test_should_leave_out_empty_counts(self):
+        assert stats.format_outcomes({'passed': 1, 'failed': 0}) == '1 passed'
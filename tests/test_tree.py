@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pytest_aspec.tree import PathStack
+
+
+class TestPathStack(object):
+
+    def test_push_should_return_the_whole_first_path(self):
+        stack = PathStack()
+
+        assert stack.push(('module', 'Outer', 'Inner')) == (
+            0, ['module', '  Outer', '    Inner']
+        )
+        assert stack.spec_indent == '    '
+
+    def test_push_should_only_return_the_segments_that_differ(self):
+        stack = PathStack()
+        stack.push(('module', 'Outer', 'Inner'))
+
+        assert stack.push(('module', 'Outer', 'Other')) == (2, ['    Other'])
+        assert stack.push(('module', 'Bar')) == (1, ['  Bar'])
+        assert stack.push(('other module',)) == (0, ['other module'])
+
+    def test_push_should_return_nothing_for_a_parent_path(self):
+        stack = PathStack()
+        stack.push(('module', 'Outer', 'Inner'))
+
+        assert stack.push(('module', 'Outer')) == (2, [])
+        assert stack.spec_indent == '  '
+
+    def test_reset_should_forget_the_path(self):
+        stack = PathStack()
+        stack.push(('module',))
+        stack.reset()
+
+        assert stack.push(('module',)) == (0, ['module'])
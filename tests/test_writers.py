@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import threading
+
+import pytest
+
+from pytest_aspec.writers import BufferedFile, ThreadedFile
+
+
+class RecordingFile(io.StringIO):
+
+    def __init__(self):
+        io.StringIO.__init__(self)
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return io.StringIO.write(self, text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class AsciiFile(RecordingFile):
+
+    def write(self, text):
+        text.encode('ascii')
+        return RecordingFile.write(self, text)
+
+
+class TestBufferedFile(object):
+
+    @pytest.fixture
+    def file(self):
+        return RecordingFile()
+
+    def test_should_hold_text_until_the_buffer_is_full(self, file):
+        buffered = BufferedFile(file, size=2)
+
+        buffered.write('one\n')
+        assert file.getvalue() == ''
+
+        buffered.write('two\n')
+        assert file.getvalue() == 'one\ntwo\n'
+        assert (file.writes, file.flushes) == (1, 1)
+
+    def test_should_ignore_flush_requests(self, file):
+        buffered = BufferedFile(file, size=10)
+
+        buffered.write('one\n')
+        buffered.flush()
+
+        assert file.getvalue() == ''
+        assert file.flushes == 0
+
+    def test_drain_should_write_pending_text(self, file):
+        buffered = BufferedFile(file, size=10)
+
+        buffered.write('one')
+        buffered.write('\n')
+        buffered.drain()
+
+        assert file.getvalue() == 'one\n'
+        assert file.flushes == 1
+
+    def test_should_delegate_other_attributes(self, file):
+        buffered = BufferedFile(file, size=10)
+
+        assert buffered.isatty() is False
+        assert buffered.getvalue == file.getvalue
+
+    def test_should_escape_text_the_file_cannot_encode(self):
+        file = AsciiFile()
+        buffered = BufferedFile(file, size=10)
+
+        buffered.write('plain\n')
+        buffered.write('\N{cherry blossom}\n')
+        buffered.drain()
+
+        assert file.getvalue() == 'plain\n\\U0001f338\\n'
+
+
+class BlockingFile(RecordingFile):
+
+    def __init__(self):
+        RecordingFile.__init__(self)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.writing.set()
+        self.release.wait(5)
+        return RecordingFile.write(self, text)
+
+
+class FailingFile(RecordingFile):
+
+    def write(self, text):
+        raise IOError('broken pipe')
+
+
+class TestThreadedFile(object):
+
+    @pytest.fixture
+    def file(self):
+        return RecordingFile()
+
+    def test_should_write_text_in_order(self, file):
+        threaded = ThreadedFile(file, size=2)
+
+        for index in range(100):
+            threaded.write('{}\n'.format(index))
+        threaded.drain()
+
+        assert file.getvalue() == ''.join(
+            '{}\n'.format(index) for index in range(100)
+        )
+        threaded.close()
+
+    def test_should_pass_flush_requests_on(self, file):
+        threaded = ThreadedFile(file, size=10)
+
+        threaded.write('one\n')
+        threaded.flush()
+        threaded.drain()
+
+        assert file.flushes == 1
+        threaded.close()
+
+    def test_should_block_writes_once_the_queue_is_full(self):
+        file = BlockingFile()
+        threaded = ThreadedFile(file, size=1)
+
+        threaded.write('one\n')
+        assert file.writing.wait(5)
+        threaded.write('two\n')
+
+        writer = threading.Thread(target=threaded.write, args=('three\n',))
+        writer.start()
+        writer.join(0.1)
+        assert writer.is_alive()
+
+        file.release.set()
+        writer.join(5)
+        threaded.close()
+        assert file.getvalue() == 'one\ntwo\nthree\n'
+
+    def test_close_should_write_everything_and_stop_the_thread(self, file):
+        threaded = ThreadedFile(file, size=10)
+
+        threaded.write('one\n')
+        threaded.close()
+        threaded.write('two\n')
+
+        assert file.getvalue() == 'one\ntwo\n'
+        assert not threaded._thread.is_alive()
+
+    def test_should_raise_errors_of_the_thread_again(self):
+        threaded = ThreadedFile(FailingFile(), size=10)
+
+        threaded.write('one\n')
+        with pytest.raises(IOError):
+            threaded.drain()
+        threaded.close()
+
+    def test_should_write_to_a_duplicate_descriptor(self, tmpdir):
+        path = tmpdir.join('out.txt')
+        with io.open(str(path), 'w', encoding='utf-8') as file:
+            threaded = ThreadedFile(file, size=10)
+            threaded.write('\N{cherry blossom}\n')
+            threaded.close()
+
+        assert threaded._output is not file
+        assert path.read_text('utf-8') == '\N{cherry blossom}\n'